@@ -0,0 +1,138 @@
+"""cascade foreign keys
+
+Revision ID: 1ae7f8125545
+Revises: ca114a303d94
+Create Date: 2026-10-19 21:26:09.370551
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1ae7f8125545'
+down_revision: Union[str, None] = 'ca114a303d94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _tables(ondelete):
+    # (name, columns, constraints, indexes, options) for every table whose
+    # foreign keys change; SQLite cannot alter a foreign key, so each one is
+    # rebuilt
+    return [
+        ('suggestions', [
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(), nullable=True),
+            sa.Column('description', sa.String(), nullable=True),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+        ], [
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete=ondelete),
+            sa.PrimaryKeyConstraint('id'),
+        ], [
+            ('ix_suggestions_id', ['id']),
+            ('ix_suggestions_title', ['title']),
+            ('ix_suggestions_created_at', ['created_at']),
+        ], {'sqlite_autoincrement': True}),
+        ('suggestion_likes', [
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('suggestion_id', sa.Integer(), nullable=False),
+        ], [
+            sa.ForeignKeyConstraint(['suggestion_id'], ['suggestions.id'], ondelete=ondelete),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete=ondelete),
+            sa.PrimaryKeyConstraint('user_id', 'suggestion_id'),
+        ], [], {}),
+        ('suggestion_dislikes', [
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('suggestion_id', sa.Integer(), nullable=False),
+        ], [
+            sa.ForeignKeyConstraint(['suggestion_id'], ['suggestions.id'], ondelete=ondelete),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete=ondelete),
+            sa.PrimaryKeyConstraint('user_id', 'suggestion_id'),
+        ], [], {}),
+        ('suggestion_minhashes', [
+            sa.Column('suggestion_id', sa.Integer(), nullable=False),
+            sa.Column('signature', sa.LargeBinary(), nullable=False),
+        ], [
+            sa.ForeignKeyConstraint(['suggestion_id'], ['suggestions.id'], ondelete=ondelete),
+            sa.PrimaryKeyConstraint('suggestion_id'),
+        ], [], {}),
+        ('suggestion_lsh_buckets', [
+            sa.Column('band', sa.Integer(), nullable=False),
+            sa.Column('bucket', sa.Integer(), nullable=False),
+            sa.Column('suggestion_id', sa.Integer(), nullable=False),
+        ], [
+            sa.ForeignKeyConstraint(['suggestion_id'], ['suggestions.id'], ondelete=ondelete),
+            sa.PrimaryKeyConstraint('band', 'bucket', 'suggestion_id'),
+        ], [
+            ('ix_suggestion_lsh_buckets_suggestion_id', ['suggestion_id']),
+        ], {}),
+        ('user_stats', [
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('suggestion_count', sa.Integer(), nullable=False),
+            sa.Column('likes_received', sa.Integer(), nullable=False),
+            sa.Column('dislikes_received', sa.Integer(), nullable=False),
+            sa.Column('score', sa.Integer(), nullable=False),
+        ], [
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete=ondelete),
+            sa.PrimaryKeyConstraint('user_id'),
+        ], [
+            ('ix_user_stats_score', ['score']),
+        ], {}),
+    ]
+
+
+def _rebuild(ondelete) -> None:
+    # Dropping suggestions drops its sqlite_sequence row, so the counter that
+    # 9a915f36971f started above every archived and voted-on id is carried over
+    connection = op.get_bind()
+    last_id = connection.execute(sa.text("SELECT seq FROM sqlite_sequence WHERE name = 'suggestions'")).scalar() or 0
+    for name, columns, constraints, indexes, options in _tables(ondelete):
+        for index_name, _ in indexes:
+            op.drop_index(index_name, table_name=name)
+        op.create_table(f'_{name}_new', *columns, *constraints, **options)
+        column_names = ', '.join(column.name for column in columns)
+        op.execute(f'INSERT INTO _{name}_new ({column_names}) SELECT {column_names} FROM {name}')
+        op.drop_table(name)
+        op.rename_table(f'_{name}_new', name)
+        for index_name, index_columns in indexes:
+            op.create_index(index_name, name, index_columns, unique=False)
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'suggestions'")
+    op.execute(
+        sa.text(
+            "INSERT INTO sqlite_sequence (name, seq) "
+            "SELECT 'suggestions', max(:last_id, (SELECT coalesce(max(id), 0) FROM suggestions))"
+        ).bindparams(last_id=last_id)
+    )
+
+
+def upgrade() -> None:
+    # Rows that already point at deleted parents would fail the check once
+    # the app turns foreign keys on
+    op.execute('DELETE FROM suggestion_likes WHERE suggestion_id NOT IN (SELECT id FROM suggestions) OR user_id NOT IN (SELECT id FROM users)')
+    op.execute('DELETE FROM suggestion_dislikes WHERE suggestion_id NOT IN (SELECT id FROM suggestions) OR user_id NOT IN (SELECT id FROM users)')
+    op.execute('DELETE FROM suggestion_lsh_buckets WHERE suggestion_id NOT IN (SELECT id FROM suggestions)')
+    op.execute('DELETE FROM suggestion_minhashes WHERE suggestion_id NOT IN (SELECT id FROM suggestions)')
+    op.execute('DELETE FROM user_stats WHERE user_id NOT IN (SELECT id FROM users)')
+    op.execute('UPDATE suggestions SET user_id = NULL WHERE user_id NOT IN (SELECT id FROM users)')
+
+    _rebuild('CASCADE')
+
+    # Cascades from suggestions and users look the child rows up by these
+    op.create_index(op.f('ix_suggestions_user_id'), 'suggestions', ['user_id'], unique=False)
+    op.create_index(op.f('ix_suggestion_likes_suggestion_id'), 'suggestion_likes', ['suggestion_id'], unique=False)
+    op.create_index(op.f('ix_suggestion_dislikes_suggestion_id'), 'suggestion_dislikes', ['suggestion_id'], unique=False)
+
+    op.add_column('archived_suggestions', sa.Column('hidden', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('archived_suggestions') as batch_op:
+        batch_op.drop_column('hidden')
+    op.drop_index(op.f('ix_suggestion_dislikes_suggestion_id'), table_name='suggestion_dislikes')
+    op.drop_index(op.f('ix_suggestion_likes_suggestion_id'), table_name='suggestion_likes')
+    op.drop_index(op.f('ix_suggestions_user_id'), table_name='suggestions')
+    _rebuild(None)
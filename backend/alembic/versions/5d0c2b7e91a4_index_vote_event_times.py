@@ -0,0 +1,27 @@
+"""index vote event times
+
+Revision ID: 5d0c2b7e91a4
+Revises: 1ae7f8125545
+Create Date: 2026-10-19 23:12:40.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d0c2b7e91a4'
+down_revision: Union[str, None] = '1ae7f8125545'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Trending reads the raw events at the leading edge of its window
+    op.create_index(op.f('ix_vote_events_created_at'), 'vote_events', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_vote_events_created_at'), table_name='vote_events')
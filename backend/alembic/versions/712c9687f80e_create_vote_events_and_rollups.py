@@ -0,0 +1,57 @@
+"""create vote events and rollups
+
+Revision ID: 712c9687f80e
+Revises: 4b6a650c7777
+Create Date: 2026-10-19 14:21:05.830412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '712c9687f80e'
+down_revision: Union[str, None] = '4b6a650c7777'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('vote_events',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('suggestion_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('delta', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('vote_rollups_hourly',
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('suggestion_id', sa.Integer(), nullable=False),
+    sa.Column('likes', sa.Integer(), nullable=False),
+    sa.Column('dislikes', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('bucket', 'suggestion_id')
+    )
+    op.create_table('vote_rollups_daily',
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('suggestion_id', sa.Integer(), nullable=False),
+    sa.Column('likes', sa.Integer(), nullable=False),
+    sa.Column('dislikes', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('bucket', 'suggestion_id')
+    )
+    checkpoint = op.create_table('vote_rollup_checkpoint',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('last_event_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(checkpoint, [{'id': 1, 'last_event_id': 0}])
+
+
+def downgrade() -> None:
+    op.drop_table('vote_rollup_checkpoint')
+    op.drop_table('vote_rollups_daily')
+    op.drop_table('vote_rollups_hourly')
+    op.drop_table('vote_events')
@@ -0,0 +1,73 @@
+"""create suggestion archive
+
+Revision ID: 9a915f36971f
+Revises: c4fd5eb83589
+Create Date: 2026-10-19 19:12:40.518337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a915f36971f'
+down_revision: Union[str, None] = 'c4fd5eb83589'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('suggestions', sa.Column('created_at', sa.DateTime(), nullable=True))
+    # Existing suggestions start ageing from the upgrade
+    op.execute("UPDATE suggestions SET created_at = strftime('%Y-%m-%d %H:%M:%f000', 'now')")
+    op.create_index(op.f('ix_suggestions_created_at'), 'suggestions', ['created_at'], unique=False)
+
+    # Archived rows, vote events and rollups keep a moved suggestion's id, so
+    # from here on SQLite must never hand an id out twice
+    with op.batch_alter_table('suggestions', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+        pass
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'suggestions'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'suggestions', max("
+        "(SELECT coalesce(max(id), 0) FROM suggestions), "
+        "(SELECT coalesce(max(suggestion_id), 0) FROM vote_events), "
+        "(SELECT coalesce(max(suggestion_id), 0) FROM vote_rollups_hourly), "
+        "(SELECT coalesce(max(suggestion_id), 0) FROM vote_rollups_daily))"
+    )
+
+    op.create_table('archived_suggestions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_archived_suggestions_user_id'), 'archived_suggestions', ['user_id'], unique=False)
+    op.create_table('archived_suggestion_likes',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('suggestion_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'suggestion_id')
+    )
+    op.create_index(op.f('ix_archived_suggestion_likes_suggestion_id'), 'archived_suggestion_likes', ['suggestion_id'], unique=False)
+    op.create_table('archived_suggestion_dislikes',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('suggestion_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'suggestion_id')
+    )
+    op.create_index(op.f('ix_archived_suggestion_dislikes_suggestion_id'), 'archived_suggestion_dislikes', ['suggestion_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_archived_suggestion_dislikes_suggestion_id'), table_name='archived_suggestion_dislikes')
+    op.drop_table('archived_suggestion_dislikes')
+    op.drop_index(op.f('ix_archived_suggestion_likes_suggestion_id'), table_name='archived_suggestion_likes')
+    op.drop_table('archived_suggestion_likes')
+    op.drop_index(op.f('ix_archived_suggestions_user_id'), table_name='archived_suggestions')
+    op.drop_table('archived_suggestions')
+    op.drop_index(op.f('ix_suggestions_created_at'), table_name='suggestions')
+    with op.batch_alter_table('suggestions') as batch_op:
+        batch_op.drop_column('created_at')
@@ -0,0 +1,39 @@
+"""create duplicate index tables
+
+Revision ID: c4fd5eb83589
+Revises: f101d4be14c8
+Create Date: 2026-10-19 17:05:14.662981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4fd5eb83589'
+down_revision: Union[str, None] = 'f101d4be14c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('suggestion_minhashes',
+    sa.Column('suggestion_id', sa.Integer(), nullable=False),
+    sa.Column('signature', sa.LargeBinary(), nullable=False),
+    sa.PrimaryKeyConstraint('suggestion_id')
+    )
+    op.create_table('suggestion_lsh_buckets',
+    sa.Column('band', sa.Integer(), nullable=False),
+    sa.Column('bucket', sa.Integer(), nullable=False),
+    sa.Column('suggestion_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('band', 'bucket', 'suggestion_id')
+    )
+    op.create_index(op.f('ix_suggestion_lsh_buckets_suggestion_id'), 'suggestion_lsh_buckets', ['suggestion_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_suggestion_lsh_buckets_suggestion_id'), table_name='suggestion_lsh_buckets')
+    op.drop_table('suggestion_lsh_buckets')
+    op.drop_table('suggestion_minhashes')
@@ -0,0 +1,73 @@
+"""add normalized login columns
+
+Revision ID: ca114a303d94
+Revises: 9a915f36971f
+Create Date: 2026-10-19 20:03:51.227104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ca114a303d94'
+down_revision: Union[str, None] = '9a915f36971f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _normalize(value):
+    # SQLite's lower() only folds ASCII, so backfill with Python's casefold()
+    # to match app.core.security.normalize_login
+    return value.strip().casefold() if value else None
+
+
+def _collisions(users) -> list:
+    clashes = []
+    for column, position in (("username", 1), ("email", 2)):
+        owners = {}
+        for user in users:
+            normalized = _normalize(user[position])
+            if normalized is not None:
+                owners.setdefault(normalized, []).append(user)
+        for normalized, sharing in owners.items():
+            if len(sharing) > 1:
+                accounts = ", ".join(f"{user[0]} ({user[position]!r})" for user in sharing)
+                clashes.append(f"{column} {normalized!r} is shared by users {accounts}")
+    return clashes
+
+
+def upgrade() -> None:
+    # SQLite runs DDL outside the transaction, so check before changing
+    # anything; the unique indexes below would otherwise fail half way
+    connection = op.get_bind()
+    users = connection.execute(sa.text("SELECT id, username, email FROM users ORDER BY id")).all()
+    clashes = _collisions(users)
+    if clashes:
+        raise RuntimeError(
+            "Cannot add normalized login columns: these accounts differ only in case or "
+            "surrounding whitespace. Rename or merge them, then run the migration again.\n  "
+            + "\n  ".join(clashes)
+        )
+
+    op.add_column('users', sa.Column('username_normalized', sa.String(), nullable=True))
+    op.add_column('users', sa.Column('email_normalized', sa.String(), nullable=True))
+
+    for user_id, username, email in users:
+        connection.execute(
+            sa.text("UPDATE users SET username_normalized = :username, email_normalized = :email WHERE id = :id"),
+            {"id": user_id, "username": _normalize(username), "email": _normalize(email)}
+        )
+
+    op.create_index(op.f('ix_users_username_normalized'), 'users', ['username_normalized'], unique=True)
+    op.create_index(op.f('ix_users_email_normalized'), 'users', ['email_normalized'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_users_email_normalized'), table_name='users')
+    op.drop_index(op.f('ix_users_username_normalized'), table_name='users')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('email_normalized')
+        batch_op.drop_column('username_normalized')
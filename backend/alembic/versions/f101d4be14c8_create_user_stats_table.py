@@ -0,0 +1,53 @@
+"""create user stats table
+
+Revision ID: f101d4be14c8
+Revises: 712c9687f80e
+Create Date: 2026-10-19 15:47:52.119806
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f101d4be14c8'
+down_revision: Union[str, None] = '712c9687f80e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('suggestion_count', sa.Integer(), nullable=False),
+    sa.Column('likes_received', sa.Integer(), nullable=False),
+    sa.Column('dislikes_received', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index(op.f('ix_user_stats_score'), 'user_stats', ['score'], unique=False)
+
+    # Backfill from the existing suggestions and votes
+    op.execute("""
+        INSERT INTO user_stats (user_id, suggestion_count, likes_received, dislikes_received, score)
+        SELECT s.user_id,
+               COUNT(*),
+               COALESCE(SUM(l.n), 0),
+               COALESCE(SUM(d.n), 0),
+               COALESCE(SUM(l.n), 0) - COALESCE(SUM(d.n), 0)
+        FROM suggestions s
+        LEFT JOIN (SELECT suggestion_id, COUNT(*) AS n FROM suggestion_likes GROUP BY suggestion_id) l
+            ON l.suggestion_id = s.id
+        LEFT JOIN (SELECT suggestion_id, COUNT(*) AS n FROM suggestion_dislikes GROUP BY suggestion_id) d
+            ON d.suggestion_id = s.id
+        WHERE s.user_id IS NOT NULL
+        GROUP BY s.user_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_user_stats_score'), table_name='user_stats')
+    op.drop_table('user_stats')
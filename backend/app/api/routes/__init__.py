@@ -2,9 +2,13 @@ from fastapi import APIRouter
 from .auth import router as auth_router
 from .users import router as users_router
 from .suggestions import router as suggestions_router  # Add this import
+from .batch import router as batch_router
+from .moderation import router as moderation_router
 
 router = APIRouter()
 
 router.include_router(auth_router, prefix="/auth", tags=["auth"])
 router.include_router(users_router, prefix="/users", tags=["users"])
-router.include_router(suggestions_router, tags=["suggestions"])  # Add this line
\ No newline at end of file
+router.include_router(suggestions_router, tags=["suggestions"])  # Add this line
+router.include_router(batch_router, tags=["batch"])
+router.include_router(moderation_router, prefix="/moderation", tags=["moderation"])
\ No newline at end of file
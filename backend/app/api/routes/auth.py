@@ -1,14 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.core.security import verify_password, create_access_token, get_password_hash
+from sqlalchemy import select, or_
+from sqlalchemy.exc import IntegrityError
+from app.core.security import verify_password, create_access_token, get_password_hash, normalize_login, SECRET_KEY, ALGORITHM
+from app.core.security import oauth2_scheme as optional_oauth2_scheme
 from app.core.database import get_db
+from app.core.revocation import revocation_store
 from app.schemas.auth import Token
 from app.schemas.user import UserCreate
 from app.models.user import User
 from datetime import timedelta
+from jose import JWTError, jwt
+from typing import Optional
 
 router = APIRouter()
 
@@ -19,15 +25,20 @@ async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db)
 ):
-    if '@' in form_data.username:
-        query = select(User).where(User.email == form_data.username)
-    else:
-        query = select(User).where(User.username == form_data.username)
-    
+    # Both columns are uniquely indexed, so this is two index probes in one
+    # statement; a username match wins over an email match
+    login = normalize_login(form_data.username)
+    query = (
+        select(User)
+        .where(or_(User.username_normalized == login, User.email_normalized == login))
+        .order_by((User.username_normalized == login).desc())
+        .limit(1)
+    )
     result = await db.execute(query)
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # bcrypt is deliberately slow; keep it off the event loop
+    if not user or not await run_in_threadpool(verify_password, form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email/username or password",
@@ -56,7 +67,20 @@ async def login(
     return response
 
 @router.post("/logout")
-async def logout():
+async def logout(
+    request: Request,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    token = token or request.cookies.get("token")
+    if token:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            if payload.get("jti"):
+                await revocation_store.revoke(db, payload["jti"], payload["exp"])
+        except JWTError:
+            pass
+
     response = JSONResponse(content={"message": "Successfully logged out"})
     response.delete_cookie(
         key="token",
@@ -69,31 +93,39 @@ async def logout():
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
 async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
-    query = select(User).where(User.username == user_data.username)
-    result = await db.execute(query)
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=400,
-            detail="Username already registered"
-        )
-    
-    query = select(User).where(User.email == user_data.email)
-    result = await db.execute(query)
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=400,
-            detail="Email already registered"
-        )
-    
     db_user = User(
         username=user_data.username,
         email=user_data.email,
+        username_normalized=normalize_login(user_data.username),
+        email_normalized=normalize_login(user_data.email),
         full_name=user_data.full_name,
-        hashed_password=get_password_hash(user_data.password)
+        hashed_password=await run_in_threadpool(get_password_hash, user_data.password)
     )
     
+    # The unique indexes do the duplicate check as part of the INSERT
     db.add(db_user)
-    await db.commit()
-    await db.refresh(db_user)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        # SQLite names only the first index it trips over, so when the email
+        # clashes check the username too; it takes precedence in the message
+        username_taken = "username" in str(e.orig)
+        if not username_taken and "email" in str(e.orig):
+            result = await db.execute(
+                select(User.id).where(User.username_normalized == db_user.username_normalized)
+            )
+            username_taken = result.first() is not None
+        if username_taken:
+            raise HTTPException(
+                status_code=400,
+                detail="Username already registered"
+            )
+        if "email" in str(e.orig):
+            raise HTTPException(
+                status_code=400,
+                detail="Email already registered"
+            )
+        raise
     
     return {"message": "User created successfully"}
\ No newline at end of file
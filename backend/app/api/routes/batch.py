@@ -0,0 +1,144 @@
+import asyncio
+from contextlib import AsyncExitStack
+from urllib.parse import urlsplit
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.dependencies.utils import solve_dependencies
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy import text
+from starlette.routing import Match
+from app.core import database
+from app.core.database import get_db
+from app.schemas.batch import BatchRequest, BatchResponse
+
+router = APIRouter()
+
+MAX_BATCH_SIZE = 20
+
+
+class SharedSession:
+    """One session handed to every operation in a batch.
+
+    An AsyncSession must not run two statements at once, so statements from
+    concurrently running handlers take turns on it. Results are buffered, so
+    the lock is only held for the round trip itself.
+    """
+
+    def __init__(self, session):
+        self._session = session
+        self._lock = asyncio.Lock()
+
+    async def execute(self, *args, **kwargs):
+        async with self._lock:
+            return await self._session.execute(*args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        async with self._lock:
+            return await self._session.scalar(*args, **kwargs)
+
+    async def scalars(self, *args, **kwargs):
+        async with self._lock:
+            return await self._session.scalars(*args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        async with self._lock:
+            return await self._session.get(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+def sub_request(request: Request, path: str) -> Request:
+    url = urlsplit(path)
+    scope = dict(request.scope)
+    scope.update({
+        "method": "GET",
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "path_params": {},
+    })
+    return Request(scope)
+
+
+def match_route(request: Request, sub: Request):
+    for route in request.app.router.routes:
+        if not isinstance(route, APIRoute) or route.endpoint is batch:
+            continue
+        match, child_scope = route.matches(sub.scope)
+        if match == Match.FULL:
+            sub.scope.update(child_scope)
+            return route
+    return None
+
+
+def error_body(exc: Exception):
+    if isinstance(exc, HTTPException):
+        return exc.status_code, {"detail": exc.detail}
+    return 422, {"detail": jsonable_encoder(exc.errors())}
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch(batch_request: BatchRequest, request: Request):
+    if len(batch_request.requests) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SIZE} requests per batch")
+    # Every operation is a GET, so the batch must not pin the client to the primary
+    request.state.read_only = True
+
+    results = {}
+    pending = []
+    async with AsyncExitStack() as stack:
+        subs = [(operation, sub_request(request, operation.path)) for operation in batch_request.requests]
+        session_factory = database.session_factory_for(subs[0][1]) if subs else database.AsyncSessionLocal
+        session = await stack.enter_async_context(session_factory())
+        # Every operation reads from the same transaction, so they all see
+        # one snapshot of the database
+        await session.execute(text("BEGIN"))
+        # Seeding the cache makes every handler's get_db resolve to the
+        # shared session; auth dependencies are cached on first use
+        dependency_cache = {(get_db, ()): SharedSession(session)}
+
+        # Dependencies are solved one at a time so the shared cache is filled
+        # before anything runs in parallel
+        for operation, sub in subs:
+            route = match_route(request, sub)
+            if route is None or "GET" not in route.methods:
+                results[operation.id] = 404, {"detail": "Not Found"}
+                continue
+            try:
+                solved = await solve_dependencies(
+                    request=sub,
+                    dependant=route.dependant,
+                    dependency_overrides_provider=request.app,
+                    dependency_cache=dependency_cache,
+                    async_exit_stack=stack,
+                    embed_body_fields=False,
+                )
+            except HTTPException as exc:
+                results[operation.id] = error_body(exc)
+                continue
+            if solved.errors:
+                results[operation.id] = error_body(RequestValidationError(solved.errors))
+                continue
+            pending.append((operation, route, solved.values))
+
+        async def run(operation, route, values):
+            try:
+                content = await route.endpoint(**values)
+                if isinstance(content, Response):
+                    results[operation.id] = 400, {"detail": "Endpoint cannot be batched"}
+                    return
+                body = await serialize_response(field=route.response_field, response_content=content)
+                results[operation.id] = route.status_code or 200, body
+            except (HTTPException, RequestValidationError) as exc:
+                results[operation.id] = error_body(exc)
+
+        await asyncio.gather(*(run(*item) for item in pending))
+
+    return {
+        "responses": [
+            {"id": operation.id, "status": results[operation.id][0], "body": results[operation.id][1]}
+            for operation in batch_request.requests
+        ]
+    }
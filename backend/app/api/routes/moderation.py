@@ -0,0 +1,50 @@
+import json
+import time
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from app.core.security import get_current_user
+from app.core.moderation import delete_many, hide_many, unhide_many, purge_user_content
+from app.models.user import User
+from app.schemas.moderation import SuggestionIds
+
+router = APIRouter()
+
+async def get_current_moderator(request: Request, current_user: User = Depends(get_current_user)) -> User:
+    if current_user.username not in request.app.state.settings.moderators:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    return current_user
+
+def progress_stream(progress) -> StreamingResponse:
+    # One JSON line per committed chunk, then a summary. Work already streamed
+    # is committed, so an interrupted job can simply be sent again
+    async def lines():
+        started = time.perf_counter()
+        processed = {}
+        async for update in progress:
+            yield json.dumps(update) + "\n"
+            if "error" in update:
+                # Chunks before the failed one stay committed; no summary
+                return
+            processed[update["phase"]] = update["processed"]
+        yield json.dumps({
+            "done": True,
+            "processed": processed,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+        }) + "\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.post("/suggestions/delete")
+async def bulk_delete_suggestions(body: SuggestionIds, moderator: User = Depends(get_current_moderator)):
+    return progress_stream(delete_many(body.ids))
+
+@router.post("/suggestions/hide")
+async def bulk_hide_suggestions(body: SuggestionIds, moderator: User = Depends(get_current_moderator)):
+    return progress_stream(hide_many(body.ids))
+
+@router.post("/suggestions/unhide")
+async def bulk_unhide_suggestions(body: SuggestionIds, moderator: User = Depends(get_current_moderator)):
+    return progress_stream(unhide_many(body.ids))
+
+@router.post("/users/{user_id}/purge")
+async def purge_user(user_id: int, moderator: User = Depends(get_current_moderator)):
+    return progress_stream(purge_user_content(user_id))
@@ -1,14 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, func, union_all
+from datetime import datetime, timedelta
 from app.core.security import SECRET_KEY, ALGORITHM
-from app.core.database import get_db
+from app.core.database import get_db, session_factory_for
+from app.core.revocation import revocation_store
+from app.core.invalidation import invalidation_bus, SUGGESTIONS
+from app.core.rollups import record_vote_event, votes_between, LIKE, DISLIKE
+from app.core.user_stats import update_user_stats
+from app.core.duplicates import index_suggestion, find_duplicates
+from app.core.feed_index import feed_index
+from app.core.archive import get_archived_suggestion
+from app.core.votes import voted_ids, vote_counts, add_votes, remove_votes
+from app.core.vote_counts import vote_count_cache
+from app.core.moderation import delete_suggestions, delete_archived_suggestions
+from app.core.export import export_suggestions
 from app.models.user import User
 from app.models.suggestion import Suggestion, suggestion_likes, suggestion_dislikes
-from app.schemas.suggestion import SuggestionCreate, SuggestionResponse, SuggestionList
+from app.models.vote_event import HourlyVoteRollup, DailyVoteRollup
+from app.schemas.suggestion import SuggestionCreate, SuggestionResponse, SuggestionList, TrendingList, DuplicateCheck
 from jose import JWTError, jwt
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -39,6 +53,9 @@ async def get_current_user(
         print("Extracted username:", username)
         if username is None:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+        if revocation_store.is_revoked(payload.get("jti")):
+            print("Token has been revoked")
+            raise HTTPException(status_code=401, detail="Invalid authentication credentials")
     except JWTError as e:
         print("JWT Error:", str(e))
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
@@ -67,8 +84,14 @@ async def create_suggestion(
     )
     
     db.add(db_suggestion)
+    await db.flush()
+    await update_user_stats(db, current_user.id, suggestions=1)
+    await index_suggestion(db, db_suggestion.id, db_suggestion.title, db_suggestion.description)
+    invalidation_bus.publish(db, SUGGESTIONS, db_suggestion.id)
     await db.commit()
     await db.refresh(db_suggestion)
+    if feed_index.loaded:
+        feed_index.add(db_suggestion.id, current_user.id)
     
     return {
         "id": db_suggestion.id,
@@ -82,6 +105,37 @@ async def create_suggestion(
         "user_has_disliked": False
     }
 
+async def has_liked(db: AsyncSession, user_id: int, suggestion_id: int) -> bool:
+    query = select(suggestion_likes).where(
+        suggestion_likes.c.user_id == user_id,
+        suggestion_likes.c.suggestion_id == suggestion_id
+    )
+    result = await db.execute(query)
+    return result.first() is not None
+
+async def has_disliked(db: AsyncSession, user_id: int, suggestion_id: int) -> bool:
+    query = select(suggestion_dislikes).where(
+        suggestion_dislikes.c.user_id == user_id,
+        suggestion_dislikes.c.suggestion_id == suggestion_id
+    )
+    result = await db.execute(query)
+    return result.first() is not None
+
+async def apply_vote(db: AsyncSession, suggestion: Suggestion, user_id: int, kind: str, delta: int):
+    record_vote_event(db, suggestion.id, user_id, kind, delta)
+    if kind == LIKE:
+        await update_user_stats(db, suggestion.user_id, likes=delta)
+    else:
+        await update_user_stats(db, suggestion.user_id, dislikes=delta)
+
+@router.post("/suggestions/check-duplicates", response_model=DuplicateCheck)
+async def check_duplicates(
+    suggestion: SuggestionCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    duplicates = await find_duplicates(db, suggestion.title, suggestion.description)
+    return {"duplicates": duplicates}
+
 async def get_token_from_cookie_optional(request: Request) -> Optional[str]:
     return request.cookies.get("token") or request.cookies.get("access_token")
 
@@ -95,7 +149,7 @@ async def get_current_user_optional(
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
-        if username is None:
+        if username is None or revocation_store.is_revoked(payload.get("jti")):
             return None
             
         query = select(User).where(User.username == username)
@@ -116,76 +170,213 @@ class SuggestionResponse(BaseModel):
     user_has_liked: bool
     user_has_disliked: bool
 
+async def hydrate_feed_page(db: AsyncSession, rows, current_user: Optional[User], strict: bool = False) -> list:
+    # The feed index supplies ids and counts; only the page's text and the
+    # caller's votes on it come from the database
+    ids = [row[0] for row in rows]
+    if not ids:
+        return []
+    
+    if strict:
+        # The index's counts can trail other workers' votes; recount the page
+        # and bring the index up to date while we are at it
+        counts = await vote_count_cache.get(db, ids, strict=True)
+        for suggestion_id, (likes_count, dislikes_count) in counts.items():
+            feed_index.set_counts(suggestion_id, likes_count, dislikes_count)
+        rows = [(suggestion_id, author_id, *counts[suggestion_id]) for suggestion_id, author_id, _, _ in rows]
+    
+    text_query = (
+        select(Suggestion.id, Suggestion.title, Suggestion.description, User.full_name, User.username)
+        .join(User, Suggestion.user_id == User.id)
+        .where(Suggestion.id.in_(ids))
+    )
+    text_result = await db.execute(text_query)
+    texts = {row[0]: row[1:] for row in text_result.all()}
+    
+    liked, disliked = set(), set()
+    if current_user:
+        liked = await voted_ids(db, suggestion_likes, current_user.id, ids)
+        disliked = await voted_ids(db, suggestion_dislikes, current_user.id, ids)
+    
+    response_suggestions = []
+    for suggestion_id, author_id, likes_count, dislikes_count in rows:
+        if suggestion_id not in texts:
+            continue
+        title, description, full_name, username = texts[suggestion_id]
+        response_suggestions.append({
+            "id": suggestion_id,
+            "title": title,
+            "description": description,
+            "user_id": author_id,
+            "user_name": full_name or username,
+            "likes_count": likes_count,
+            "dislikes_count": dislikes_count,
+            "user_has_liked": suggestion_id in liked,
+            "user_has_disliked": suggestion_id in disliked
+        })
+    return response_suggestions
+
+async def page_response(
+    db: AsyncSession,
+    suggestions_with_users,
+    current_user: Optional[User],
+    strict: bool = False
+) -> list:
+    # Counts and the caller's votes for the whole page in at most four queries
+    ids = [suggestion.id for suggestion, _ in suggestions_with_users]
+    counts = await vote_count_cache.get(db, ids, strict)
+    liked, disliked = set(), set()
+    if current_user:
+        liked = await voted_ids(db, suggestion_likes, current_user.id, ids)
+        disliked = await voted_ids(db, suggestion_dislikes, current_user.id, ids)
+    
+    return [
+        {
+            "id": suggestion.id,
+            "title": suggestion.title,
+            "description": suggestion.description,
+            "user_id": suggestion.user_id,
+            "user_name": user.full_name or user.username,
+            "likes_count": counts[suggestion.id][0],
+            "dislikes_count": counts[suggestion.id][1],
+            "user_has_liked": suggestion.id in liked,
+            "user_has_disliked": suggestion.id in disliked
+        }
+        for suggestion, user in suggestions_with_users
+    ]
+
 @router.get("/suggestions", response_model=SuggestionList)
 async def get_suggestions(
     skip: int = 0,
     limit: int = 10,
+    sort: Literal["oldest", "newest", "top"] = "oldest",
+    user_id: Optional[int] = None,
+    strict: bool = False,
     current_user: Optional[User] = Depends(get_current_user_optional),
     db: AsyncSession = Depends(get_db)
 ):
+    if feed_index.loaded:
+        total, rows = feed_index.page(skip, limit, sort, user_id)
+        suggestions = await hydrate_feed_page(db, rows, current_user, strict)
+        return {"suggestions": suggestions, "total": total}
 
     count_query = select(func.count()).select_from(Suggestion)
+    if user_id is not None:
+        count_query = count_query.where(Suggestion.user_id == user_id)
     total_count = await db.execute(count_query)
     total = total_count.scalar_one()
     
+    query = select(Suggestion, User).join(User, Suggestion.user_id == User.id)
+    if user_id is not None:
+        query = query.where(Suggestion.user_id == user_id)
+    if sort == "top":
+        likes = (
+            select(func.count()).select_from(suggestion_likes)
+            .where(suggestion_likes.c.suggestion_id == Suggestion.id)
+            .scalar_subquery()
+        )
+        dislikes = (
+            select(func.count()).select_from(suggestion_dislikes)
+            .where(suggestion_dislikes.c.suggestion_id == Suggestion.id)
+            .scalar_subquery()
+        )
+        query = query.order_by((likes - dislikes).desc(), Suggestion.id.desc())
+    elif sort == "newest":
+        query = query.order_by(Suggestion.id.desc())
+    else:
+        query = query.order_by(Suggestion.id)
+    query = query.offset(skip).limit(limit)
+    result = await db.execute(query)
+    suggestions_with_users = result.all()
+    
+    response_suggestions = await page_response(db, suggestions_with_users, current_user, strict)
+    
+    return {"suggestions": response_suggestions, "total": total}
+
+@router.get("/suggestions/export")
+async def export_all_suggestions(request: Request, after_id: int = 0):
+    # The body is sent after dependencies have been torn down, so the
+    # generator opens a session of its own rather than using get_db
+    return StreamingResponse(
+        export_suggestions(session_factory_for(request), after_id),
+        media_type="application/x-ndjson"
+    )
+
+TRENDING_WINDOWS = {
+    "1h": (HourlyVoteRollup, timedelta(hours=1)),
+    "24h": (HourlyVoteRollup, timedelta(hours=24)),
+    "7d": (DailyVoteRollup, timedelta(days=7)),
+}
+
+@router.get("/suggestions/trending", response_model=TrendingList)
+async def get_trending_suggestions(
+    window: Literal["1h", "24h", "7d"] = "24h",
+    limit: int = 10,
+    db: AsyncSession = Depends(get_db)
+):
+    # Whole buckets come from the rollups, so the cost depends on the number
+    # of buckets in the window rather than on the size of the vote history.
+    # The bucket the window starts in is only partly inside it; that part is
+    # read from the raw events, so a 1h window never counts up to 2h
+    rollup, span = TRENDING_WINDOWS[window]
+    since = datetime.utcnow() - span
+    if rollup is DailyVoteRollup:
+        boundary = since.replace(hour=0, minute=0, second=0, microsecond=0)
+        if boundary < since:
+            boundary += timedelta(days=1)
+    else:
+        boundary = since.replace(minute=0, second=0, microsecond=0)
+        if boundary < since:
+            boundary += timedelta(hours=1)
+
+    buckets = select(
+        rollup.suggestion_id,
+        rollup.likes.label("likes"),
+        rollup.dislikes.label("dislikes")
+    ).where(rollup.bucket >= boundary)
+    votes = union_all(buckets, votes_between(since, boundary)).subquery()
+    scores = (
+        select(
+            votes.c.suggestion_id,
+            func.sum(votes.c.likes).label("likes"),
+            func.sum(votes.c.dislikes).label("dislikes")
+        )
+        .group_by(votes.c.suggestion_id)
+        .subquery()
+    )
+    score = scores.c.likes - scores.c.dislikes
     query = (
-        select(Suggestion, User)
+        select(Suggestion, User, scores.c.likes, scores.c.dislikes)
+        .join(Suggestion, Suggestion.id == scores.c.suggestion_id)
         .join(User, Suggestion.user_id == User.id)
-        .offset(skip)
+        .order_by(score.desc(), scores.c.likes.desc(), Suggestion.id.desc())
         .limit(limit)
     )
     result = await db.execute(query)
-    suggestions_with_users = result.all()
-    
-    response_suggestions = []
-    for suggestion, user in suggestions_with_users:
-        user_has_liked = False
-        user_has_disliked = False
-        
-        if current_user:
-            has_liked_query = select(suggestion_likes).where(
-                suggestion_likes.c.user_id == current_user.id,
-                suggestion_likes.c.suggestion_id == suggestion.id
-            )
-            has_liked_result = await db.execute(has_liked_query)
-            user_has_liked = has_liked_result.first() is not None
-            
-            has_disliked_query = select(suggestion_dislikes).where(
-                suggestion_dislikes.c.user_id == current_user.id,
-                suggestion_dislikes.c.suggestion_id == suggestion.id
-            )
-            has_disliked_result = await db.execute(has_disliked_query)
-            user_has_disliked = has_disliked_result.first() is not None
-        
-        likes_count_query = select(func.count()).select_from(suggestion_likes).where(
-            suggestion_likes.c.suggestion_id == suggestion.id
-        )
-        likes_count_result = await db.execute(likes_count_query)
-        likes_count = likes_count_result.scalar_one()
-        
-        dislikes_count_query = select(func.count()).select_from(suggestion_dislikes).where(
-            suggestion_dislikes.c.suggestion_id == suggestion.id
-        )
-        dislikes_count_result = await db.execute(dislikes_count_query)
-        dislikes_count = dislikes_count_result.scalar_one()
-        
-        response_suggestions.append({
+
+    trending = []
+    for suggestion, user, likes, dislikes in result.all():
+        trending.append({
             "id": suggestion.id,
             "title": suggestion.title,
             "description": suggestion.description,
             "user_id": suggestion.user_id,
             "user_name": user.full_name or user.username,
-            "likes_count": likes_count,
-            "dislikes_count": dislikes_count,
-            "user_has_liked": user_has_liked,
-            "user_has_disliked": user_has_disliked
+            "likes": likes,
+            "dislikes": dislikes,
+            "score": likes - dislikes
         })
-    
-    return {"suggestions": response_suggestions, "total": total}
+
+    return {"window": window, "suggestions": trending}
+
+@router.get("/suggestions/vote-counts/metrics")
+async def get_vote_count_metrics():
+    return vote_count_cache.metrics()
 
 @router.get("/suggestions/public/{suggestion_id}", response_model=SuggestionResponse)
 async def get_public_suggestion(
     suggestion_id: int,
+    strict: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
     query = select(Suggestion, User).join(User, Suggestion.user_id == User.id).where(Suggestion.id == suggestion_id)
@@ -193,21 +384,16 @@ async def get_public_suggestion(
     suggestion_with_user = result.first()
     
     if suggestion_with_user is None:
-        raise HTTPException(status_code=404, detail="Suggestion not found")
+        # Old suggestions live in the archive tables
+        archived = await get_archived_suggestion(db, suggestion_id)
+        if archived is None:
+            raise HTTPException(status_code=404, detail="Suggestion not found")
+        return archived
     
     suggestion, user = suggestion_with_user
     
-    likes_count_query = select(func.count()).select_from(suggestion_likes).where(
-        suggestion_likes.c.suggestion_id == suggestion.id
-    )
-    likes_count_result = await db.execute(likes_count_query)
-    likes_count = likes_count_result.scalar_one()
-    
-    dislikes_count_query = select(func.count()).select_from(suggestion_dislikes).where(
-        suggestion_dislikes.c.suggestion_id == suggestion.id
-    )
-    dislikes_count_result = await db.execute(dislikes_count_query)
-    dislikes_count = dislikes_count_result.scalar_one()
+    counts = await vote_count_cache.get(db, [suggestion.id], strict)
+    likes_count, dislikes_count = counts[suggestion.id]
     
     return {
         "id": suggestion.id,
@@ -220,45 +406,6 @@ async def get_public_suggestion(
         "user_has_liked": False,
         "user_has_disliked": False
     }
-    
-    has_liked_query = select(suggestion_likes).where(
-        suggestion_likes.c.user_id == current_user.id,
-        suggestion_likes.c.suggestion_id == suggestion.id
-    )
-    has_liked_result = await db.execute(has_liked_query)
-    user_has_liked = has_liked_result.first() is not None
-    
-    has_disliked_query = select(suggestion_dislikes).where(
-        suggestion_dislikes.c.user_id == current_user.id,
-        suggestion_dislikes.c.suggestion_id == suggestion.id
-    )
-    has_disliked_result = await db.execute(has_disliked_query)
-    user_has_disliked = has_disliked_result.first() is not None
-    
-    # Count likes and dislikes
-    likes_count_query = select(func.count()).select_from(suggestion_likes).where(
-        suggestion_likes.c.suggestion_id == suggestion.id
-    )
-    likes_count_result = await db.execute(likes_count_query)
-    likes_count = likes_count_result.scalar_one()
-    
-    dislikes_count_query = select(func.count()).select_from(suggestion_dislikes).where(
-        suggestion_dislikes.c.suggestion_id == suggestion.id
-    )
-    dislikes_count_result = await db.execute(dislikes_count_query)
-    dislikes_count = dislikes_count_result.scalar_one()
-    
-    return {
-        "id": suggestion.id,
-        "title": suggestion.title,
-        "description": suggestion.description,
-        "user_id": suggestion.user_id,
-        "user_name": user.full_name or user.username,
-        "likes_count": likes_count,
-        "dislikes_count": dislikes_count,
-        "user_has_liked": user_has_liked,
-        "user_has_disliked": user_has_disliked
-    }
 
 @router.post("/suggestions/{suggestion_id}/like", response_model=SuggestionResponse)
 async def like_suggestion(
@@ -273,62 +420,36 @@ async def like_suggestion(
     if suggestion is None:
         raise HTTPException(status_code=404, detail="Suggestion not found")
     
-    has_liked_query = select(suggestion_likes).where(
-        suggestion_likes.c.user_id == current_user.id,
-        suggestion_likes.c.suggestion_id == suggestion.id
-    )
-    has_liked_result = await db.execute(has_liked_query)
-    already_liked = has_liked_result.first() is not None
+    already_liked = await has_liked(db, current_user.id, suggestion.id)
     
-    has_disliked_query = select(suggestion_dislikes).where(
-        suggestion_dislikes.c.user_id == current_user.id,
-        suggestion_dislikes.c.suggestion_id == suggestion.id
-    )
-    has_disliked_result = await db.execute(has_disliked_query)
-    already_disliked = has_disliked_result.first() is not None
+    already_disliked = await has_disliked(db, current_user.id, suggestion.id)
     
     if already_liked:
-        await db.execute(
-            suggestion_likes.delete().where(
-                suggestion_likes.c.user_id == current_user.id,
-                suggestion_likes.c.suggestion_id == suggestion.id
-            )
-        )
+        await remove_votes(db, suggestion_likes, current_user.id, [suggestion.id])
+        await apply_vote(db, suggestion, current_user.id, LIKE, -1)
         user_has_liked = False
     else:
-        await db.execute(
-            suggestion_likes.insert().values(
-                user_id=current_user.id,
-                suggestion_id=suggestion.id
-            )
-        )
+        await add_votes(db, suggestion_likes, current_user.id, [suggestion.id])
+        await apply_vote(db, suggestion, current_user.id, LIKE, 1)
         user_has_liked = True
         
         if already_disliked:
-            await db.execute(
-                suggestion_dislikes.delete().where(
-                    suggestion_dislikes.c.user_id == current_user.id,
-                    suggestion_dislikes.c.suggestion_id == suggestion.id
-                )
-            )
+            await remove_votes(db, suggestion_dislikes, current_user.id, [suggestion.id])
+            await apply_vote(db, suggestion, current_user.id, DISLIKE, -1)
     
+    invalidation_bus.publish(db, SUGGESTIONS, suggestion.id)
     await db.commit()
     
     user_query = select(User).where(User.id == suggestion.user_id)
     user_result = await db.execute(user_query)
     user = user_result.scalar_one_or_none()
     
-    likes_count_query = select(func.count()).select_from(suggestion_likes).where(
-        suggestion_likes.c.suggestion_id == suggestion.id
-    )
-    likes_count_result = await db.execute(likes_count_query)
-    likes_count = likes_count_result.scalar_one()
-    
-    dislikes_count_query = select(func.count()).select_from(suggestion_dislikes).where(
-        suggestion_dislikes.c.suggestion_id == suggestion.id
-    )
-    dislikes_count_result = await db.execute(dislikes_count_query)
-    dislikes_count = dislikes_count_result.scalar_one()
+    # Count after the commit: the response and the feed index both get the
+    # numbers that include this vote, never a cached value from before it
+    counts = await vote_count_cache.get(db, [suggestion.id], strict=True)
+    likes_count, dislikes_count = counts[suggestion.id]
+    if feed_index.loaded:
+        feed_index.set_counts(suggestion.id, likes_count, dislikes_count)
     
     return {
         "id": suggestion.id,
@@ -355,62 +476,36 @@ async def dislike_suggestion(
     if suggestion is None:
         raise HTTPException(status_code=404, detail="Suggestion not found")
     
-    has_disliked_query = select(suggestion_dislikes).where(
-        suggestion_dislikes.c.user_id == current_user.id,
-        suggestion_dislikes.c.suggestion_id == suggestion.id
-    )
-    has_disliked_result = await db.execute(has_disliked_query)
-    already_disliked = has_disliked_result.first() is not None
+    already_disliked = await has_disliked(db, current_user.id, suggestion.id)
     
-    has_liked_query = select(suggestion_likes).where(
-        suggestion_likes.c.user_id == current_user.id,
-        suggestion_likes.c.suggestion_id == suggestion.id
-    )
-    has_liked_result = await db.execute(has_liked_query)
-    already_liked = has_liked_result.first() is not None
+    already_liked = await has_liked(db, current_user.id, suggestion.id)
     
     if already_disliked:
-        await db.execute(
-            suggestion_dislikes.delete().where(
-                suggestion_dislikes.c.user_id == current_user.id,
-                suggestion_dislikes.c.suggestion_id == suggestion.id
-            )
-        )
+        await remove_votes(db, suggestion_dislikes, current_user.id, [suggestion.id])
+        await apply_vote(db, suggestion, current_user.id, DISLIKE, -1)
         user_has_disliked = False
     else:
-        await db.execute(
-            suggestion_dislikes.insert().values(
-                user_id=current_user.id,
-                suggestion_id=suggestion.id
-            )
-        )
+        await add_votes(db, suggestion_dislikes, current_user.id, [suggestion.id])
+        await apply_vote(db, suggestion, current_user.id, DISLIKE, 1)
         user_has_disliked = True
         
         if already_liked:
-            await db.execute(
-                suggestion_likes.delete().where(
-                    suggestion_likes.c.user_id == current_user.id,
-                    suggestion_likes.c.suggestion_id == suggestion.id
-                )
-            )
+            await remove_votes(db, suggestion_likes, current_user.id, [suggestion.id])
+            await apply_vote(db, suggestion, current_user.id, LIKE, -1)
     
+    invalidation_bus.publish(db, SUGGESTIONS, suggestion.id)
     await db.commit()
     
     user_query = select(User).where(User.id == suggestion.user_id)
     user_result = await db.execute(user_query)
     user = user_result.scalar_one_or_none()
 
-    likes_count_query = select(func.count()).select_from(suggestion_likes).where(
-        suggestion_likes.c.suggestion_id == suggestion.id
-    )
-    likes_count_result = await db.execute(likes_count_query)
-    likes_count = likes_count_result.scalar_one()
-    
-    dislikes_count_query = select(func.count()).select_from(suggestion_dislikes).where(
-        suggestion_dislikes.c.suggestion_id == suggestion.id
-    )
-    dislikes_count_result = await db.execute(dislikes_count_query)
-    dislikes_count = dislikes_count_result.scalar_one()
+    # Count after the commit: the response and the feed index both get the
+    # numbers that include this vote, never a cached value from before it
+    counts = await vote_count_cache.get(db, [suggestion.id], strict=True)
+    likes_count, dislikes_count = counts[suggestion.id]
+    if feed_index.loaded:
+        feed_index.set_counts(suggestion.id, likes_count, dislikes_count)
     
     return {
         "id": suggestion.id,
@@ -430,41 +525,28 @@ async def delete_suggestion(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    query = select(Suggestion).where(
-        Suggestion.id == suggestion_id,
-        Suggestion.user_id == current_user.id
-    )
-    result = await db.execute(query)
-    suggestion = result.scalar_one_or_none()
-    
-    if suggestion is None:
+    # One SELECT for ownership and counts, one DELETE; the vote and duplicate
+    # index rows go with it through ON DELETE CASCADE
+    # Read before the first call: its rollback expires current_user
+    author_id = current_user.id
+    deleted = await delete_suggestions(db, [suggestion_id], author_id=author_id)
+    if not deleted:
+        # Archived suggestions are still public, so their authors can delete them too
+        deleted = await delete_archived_suggestions(db, [suggestion_id], author_id=author_id)
+    
+    if not deleted:
         raise HTTPException(
             status_code=404,
             detail="Suggestion not found or you don't have permission to delete it"
         )
-    
-    await db.execute(
-        suggestion_likes.delete().where(
-            suggestion_likes.c.suggestion_id == suggestion_id
-        )
-    )
-    await db.execute(
-        suggestion_dislikes.delete().where(
-            suggestion_dislikes.c.suggestion_id == suggestion_id
-        )
-    )
-    
-    await db.execute(
-        delete(Suggestion).where(Suggestion.id == suggestion_id)
-    )
-    
-    await db.commit()
     return None
+
 @router.get("/suggestions/user/{user_id}", response_model=SuggestionList)
 async def get_user_suggestions(
     user_id: int,
     skip: int = 0,
     limit: int = 10,
+    strict: bool = False,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -476,44 +558,23 @@ async def get_user_suggestions(
     result = await db.execute(query)
     suggestions_with_users = result.all()
     
-    response_suggestions = []
-    for suggestion, user in suggestions_with_users:
-        has_liked_query = select(suggestion_likes).where(
-            suggestion_likes.c.user_id == current_user.id,
-            suggestion_likes.c.suggestion_id == suggestion.id
-        )
-        has_liked_result = await db.execute(has_liked_query)
-        user_has_liked = has_liked_result.first() is not None
-        
-        has_disliked_query = select(suggestion_dislikes).where(
-            suggestion_dislikes.c.user_id == current_user.id,
-            suggestion_dislikes.c.suggestion_id == suggestion.id
-        )
-        has_disliked_result = await db.execute(has_disliked_query)
-        user_has_disliked = has_disliked_result.first() is not None
-        
-        likes_count_query = select(func.count()).select_from(suggestion_likes).where(
-            suggestion_likes.c.suggestion_id == suggestion.id
-        )
-        likes_count_result = await db.execute(likes_count_query)
-        likes_count = likes_count_result.scalar_one()
-        
-        dislikes_count_query = select(func.count()).select_from(suggestion_dislikes).where(
-            suggestion_dislikes.c.suggestion_id == suggestion.id
-        )
-        dislikes_count_result = await db.execute(dislikes_count_query)
-        dislikes_count = dislikes_count_result.scalar_one()
-        
-        response_suggestions.append({
-            "id": suggestion.id,
-            "title": suggestion.title,
-            "description": suggestion.description,
-            "user_id": suggestion.user_id,
-            "user_name": user.full_name or user.username,
-            "likes_count": likes_count,
-            "dislikes_count": dislikes_count,
-            "user_has_liked": user_has_liked,
-            "user_has_disliked": user_has_disliked
-        })
+    response_suggestions = await page_response(db, suggestions_with_users, current_user, strict)
     
-    return {"suggestions": response_suggestions, "total": total}
\ No newline at end of file
+    return {"suggestions": response_suggestions, "total": total}
+
+async def warm_up(db: AsyncSession):
+    # Run the read paths once so SQLAlchemy has compiled and cached their
+    # statements before the first real request arrives
+    anonymous = User(id=0, username="")
+    await db.execute(select(User).where(User.username == anonymous.username))
+    await get_suggestions(skip=0, limit=1, current_user=None, db=db)
+    await get_suggestions(skip=0, limit=1, current_user=anonymous, db=db)
+    await get_user_suggestions(user_id=0, skip=0, limit=1, current_user=anonymous, db=db)
+    await vote_counts(db, suggestion_likes, [0])
+    await vote_counts(db, suggestion_dislikes, [0])
+    await has_liked(db, 0, 0)
+    await has_disliked(db, 0, 0)
+    try:
+        await get_public_suggestion(suggestion_id=0, db=db)
+    except HTTPException:
+        pass
@@ -3,7 +3,9 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.security import get_current_user
 from app.models.user import User
+from app.models.user_stats import UserStats
 from app.core.database import get_db
+from app.schemas.user import UserStatsResponse, Leaderboard
 
 router = APIRouter()
 
@@ -33,6 +35,45 @@ async def get_public_user_info(user_id: int, db: AsyncSession = Depends(get_db))
         "full_name": user.full_name
     }
 
+def stats_response(user: User, stats: UserStats | None) -> dict:
+    return {
+        "user_id": user.id,
+        "username": user.username,
+        "full_name": user.full_name,
+        "suggestion_count": stats.suggestion_count if stats else 0,
+        "likes_received": stats.likes_received if stats else 0,
+        "dislikes_received": stats.dislikes_received if stats else 0,
+        "score": stats.score if stats else 0
+    }
+
+@router.get("/leaderboard", response_model=Leaderboard)
+async def get_leaderboard(limit: int = 10, db: AsyncSession = Depends(get_db)):
+    query = (
+        select(UserStats, User)
+        .join(User, UserStats.user_id == User.id)
+        .order_by(UserStats.score.desc(), UserStats.likes_received.desc(), UserStats.user_id)
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    
+    return {"users": [stats_response(user, stats) for stats, user in result.all()]}
+
+@router.get("/{user_id}/stats", response_model=UserStatsResponse)
+async def get_user_stats(user_id: int, db: AsyncSession = Depends(get_db)):
+    query = (
+        select(User, UserStats)
+        .outerjoin(UserStats, UserStats.user_id == User.id)
+        .where(User.id == user_id)
+    )
+    result = await db.execute(query)
+    row = result.first()
+    
+    if row is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    user, stats = row
+    return stats_response(user, stats)
+
 @router.get("/{user_id}")
 async def get_user(
     user_id: int,
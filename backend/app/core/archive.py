@@ -0,0 +1,217 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import select, delete, literal, func, and_
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.invalidation import invalidation_bus, SUGGESTIONS
+from app.core.feed_index import feed_index
+from app.core.vote_counts import vote_count_cache
+from app.core.votes import vote_counts
+from app.core.duplicates import index_suggestion
+from app.models.suggestion import Suggestion, suggestion_likes, suggestion_dislikes
+from app.models.archive import ArchivedSuggestion, archived_suggestion_likes, archived_suggestion_dislikes
+from app.models.user import User
+from app.models.vote_event import DailyVoteRollup
+
+ARCHIVE_BATCH_SIZE = 500
+
+
+async def move_to_archive(db: AsyncSession, condition, limit: Optional[int] = None, hidden: bool = False) -> List[int]:
+    """Move hot suggestions matching ``condition``, with their votes, into the archive tables.
+
+    Commits on success and returns the moved ids.
+    """
+    chosen = (
+        select(
+            Suggestion.id,
+            Suggestion.title,
+            Suggestion.description,
+            Suggestion.user_id,
+            Suggestion.created_at,
+            literal(datetime.utcnow(), ArchivedSuggestion.archived_at.type),
+            literal(hidden, ArchivedSuggestion.hidden.type)
+        )
+        .where(condition)
+        .order_by(Suggestion.id)
+    )
+    if limit is not None:
+        chosen = chosen.limit(limit)
+    # Picking the rows and copying them is one statement, so it holds the
+    # write lock from the start and two workers can never move the same rows
+    result = await db.execute(
+        insert(ArchivedSuggestion)
+        .from_select(["id", "title", "description", "user_id", "created_at", "archived_at", "hidden"], chosen)
+        .returning(ArchivedSuggestion.id)
+    )
+    ids = result.scalars().all()
+    if not ids:
+        await db.rollback()
+        return []
+
+    for hot, cold_table in (
+        (suggestion_likes, archived_suggestion_likes),
+        (suggestion_dislikes, archived_suggestion_dislikes),
+    ):
+        await db.execute(
+            insert(cold_table)
+            .from_select(
+                ["user_id", "suggestion_id"],
+                select(hot.c.user_id, hot.c.suggestion_id).where(hot.c.suggestion_id.in_(ids))
+            )
+            .on_conflict_do_nothing()
+        )
+
+    # Cascades take the hot votes and duplicate-index rows with the suggestions
+    await db.execute(delete(Suggestion).where(Suggestion.id.in_(ids)))
+    for suggestion_id in ids:
+        invalidation_bus.publish(db, SUGGESTIONS, suggestion_id)
+    await db.commit()
+
+    for suggestion_id in ids:
+        vote_count_cache.forget(suggestion_id)
+        if feed_index.loaded:
+            feed_index.remove(suggestion_id)
+    return ids
+
+
+async def archive_batch(
+    db: AsyncSession,
+    older_than: datetime,
+    inactive_since: datetime,
+    batch_size: int = ARCHIVE_BATCH_SIZE
+) -> List[int]:
+    """Move one chunk of cold suggestions and their votes into the archive tables.
+
+    A suggestion is cold when it was created before ``older_than`` and has no
+    votes rolled up since ``inactive_since``. Returns the archived ids.
+    """
+    recently_voted = select(DailyVoteRollup.suggestion_id).where(
+        DailyVoteRollup.bucket >= inactive_since.replace(hour=0, minute=0, second=0, microsecond=0)
+    )
+    return await move_to_archive(
+        db,
+        and_(Suggestion.created_at < older_than, Suggestion.id.not_in(recently_voted)),
+        limit=batch_size
+    )
+
+
+async def restore_hidden(db: AsyncSession, suggestion_ids: List[int]) -> List[int]:
+    """Move hidden suggestions back into the hot tables. Commits and returns the restored ids."""
+    # Authors or voters deleted in the meantime would fail the foreign keys
+    existing_users = select(User.id)
+    result = await db.execute(
+        insert(Suggestion)
+        .from_select(
+            ["id", "title", "description", "user_id", "created_at"],
+            select(
+                ArchivedSuggestion.id,
+                ArchivedSuggestion.title,
+                ArchivedSuggestion.description,
+                ArchivedSuggestion.user_id,
+                ArchivedSuggestion.created_at
+            ).where(
+                ArchivedSuggestion.id.in_(suggestion_ids),
+                ArchivedSuggestion.hidden.is_(True),
+                ArchivedSuggestion.user_id.in_(existing_users)
+            )
+        )
+        .returning(Suggestion.id, Suggestion.user_id, Suggestion.title, Suggestion.description)
+    )
+    restored = result.all()
+    if not restored:
+        await db.rollback()
+        return []
+    ids = [row[0] for row in restored]
+
+    for hot, cold_table in (
+        (suggestion_likes, archived_suggestion_likes),
+        (suggestion_dislikes, archived_suggestion_dislikes),
+    ):
+        await db.execute(
+            insert(hot)
+            .from_select(
+                ["user_id", "suggestion_id"],
+                select(cold_table.c.user_id, cold_table.c.suggestion_id).where(
+                    cold_table.c.suggestion_id.in_(ids),
+                    cold_table.c.user_id.in_(existing_users)
+                )
+            )
+            .on_conflict_do_nothing()
+        )
+        await db.execute(delete(cold_table).where(cold_table.c.suggestion_id.in_(ids)))
+    await db.execute(delete(ArchivedSuggestion).where(ArchivedSuggestion.id.in_(ids)))
+
+    for suggestion_id, _, title, description in restored:
+        await index_suggestion(db, suggestion_id, title or "", description or "")
+        invalidation_bus.publish(db, SUGGESTIONS, suggestion_id)
+    likes = await vote_counts(db, suggestion_likes, ids)
+    dislikes = await vote_counts(db, suggestion_dislikes, ids)
+    await db.commit()
+
+    for suggestion_id, author_id, _, _ in restored:
+        vote_count_cache.forget(suggestion_id)
+        if feed_index.loaded:
+            feed_index.add(suggestion_id, author_id or 0, likes[suggestion_id], dislikes[suggestion_id])
+    return ids
+
+
+async def archive_cold_suggestions(
+    session_factory,
+    age: timedelta,
+    inactivity: timedelta,
+    batch_size: int = ARCHIVE_BATCH_SIZE
+) -> int:
+    archived = 0
+    while True:
+        now = datetime.utcnow()
+        async with session_factory() as session:
+            ids = await archive_batch(session, now - age, now - inactivity, batch_size)
+        archived += len(ids)
+        if len(ids) < batch_size:
+            return archived
+        # Give request handlers a turn at the write lock between chunks
+        await asyncio.sleep(0)
+
+
+async def run_archiver(session_factory, interval: float, age: timedelta, inactivity: timedelta) -> None:
+    while True:
+        try:
+            archived = await archive_cold_suggestions(session_factory, age, inactivity)
+            if archived:
+                print(f"Archived {archived} suggestions")
+        except Exception as e:
+            print(f"Suggestion archiving failed: {str(e)}")
+        await asyncio.sleep(interval)
+
+
+async def get_archived_suggestion(db: AsyncSession, suggestion_id: int) -> Optional[dict]:
+    result = await db.execute(
+        select(ArchivedSuggestion, User)
+        .join(User, ArchivedSuggestion.user_id == User.id)
+        .where(ArchivedSuggestion.id == suggestion_id, ArchivedSuggestion.hidden.is_(False))
+    )
+    row = result.first()
+    if row is None:
+        return None
+    suggestion, user = row
+
+    likes = await db.execute(
+        select(func.count()).select_from(archived_suggestion_likes)
+        .where(archived_suggestion_likes.c.suggestion_id == suggestion_id)
+    )
+    dislikes = await db.execute(
+        select(func.count()).select_from(archived_suggestion_dislikes)
+        .where(archived_suggestion_dislikes.c.suggestion_id == suggestion_id)
+    )
+    return {
+        "id": suggestion.id,
+        "title": suggestion.title,
+        "description": suggestion.description,
+        "user_id": suggestion.user_id,
+        "user_name": user.full_name or user.username,
+        "likes_count": likes.scalar_one(),
+        "dislikes_count": dislikes.scalar_one(),
+        "user_has_liked": False,
+        "user_has_disliked": False
+    }
@@ -0,0 +1,58 @@
+import os
+from typing import List, Optional
+from pydantic import BaseModel
+
+class Settings(BaseModel):
+    database_url: str = "sqlite+aiosqlite:///./sql_app.db"
+    # e.g. "sqlite+aiosqlite:///file:./sql_app.db?mode=ro&uri=true" for a
+    # read-only connection to the primary file, or replica URLs
+    read_database_urls: List[str] = []
+    read_your_writes_seconds: int = 5
+    allow_origins: List[str] = ["http://localhost:3000"]
+    workers: int = 1
+    check_migrations: bool = True
+    warm_up: bool = True
+    rollup_interval_seconds: float = 10.0
+    # Serve GET /api/suggestions from the in-process columnar index
+    feed_index: bool = False
+    # Requests sending "X-Profile: <profile_token>" are profiled; a sample
+    # rate above zero also profiles that fraction of all requests
+    profile_token: Optional[str] = None
+    profile_sample_rate: float = 0.0
+    profile_dir: str = "./profiles"
+    # Suggestions older than this with no votes for archive_inactive_days are
+    # moved to the archive tables; None turns archiving off
+    archive_after_days: Optional[int] = None
+    archive_inactive_days: int = 30
+    archive_interval_seconds: float = 3600.0
+    # Vote counts may be served up to this many seconds old while they are
+    # recounted in the background; 0 always counts exactly
+    vote_count_max_staleness: float = 2.0
+    # Hard bound: counts older than this are recounted before they are served,
+    # even if the background refresh or an invalidation never arrived
+    vote_count_max_age: float = 30.0
+    # Usernames allowed to use the /api/moderation endpoints
+    moderators: List[str] = []
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        settings = cls()
+        return settings.model_copy(update={
+            "database_url": os.environ.get("DATABASE_URL", settings.database_url),
+            "read_database_urls": [
+                url for url in os.environ.get("READ_DATABASE_URLS", "").split(",") if url
+            ],
+            "workers": int(os.environ.get("APP_WORKERS", settings.workers)),
+            "check_migrations": os.environ.get("CHECK_MIGRATIONS", "1") != "0",
+            "feed_index": os.environ.get("FEED_INDEX", "0") == "1",
+            "profile_token": os.environ.get("PROFILE_TOKEN") or None,
+            "profile_sample_rate": float(os.environ.get("PROFILE_SAMPLE_RATE", settings.profile_sample_rate)),
+            "profile_dir": os.environ.get("PROFILE_DIR", settings.profile_dir),
+            "archive_after_days": int(os.environ["ARCHIVE_AFTER_DAYS"]) if os.environ.get("ARCHIVE_AFTER_DAYS") else None,
+            "archive_inactive_days": int(os.environ.get("ARCHIVE_INACTIVE_DAYS", settings.archive_inactive_days)),
+            "vote_count_max_staleness": float(
+                os.environ.get("VOTE_COUNT_MAX_STALENESS", settings.vote_count_max_staleness)
+            ),
+            "vote_count_max_age": float(os.environ.get("VOTE_COUNT_MAX_AGE", settings.vote_count_max_age)),
+            "moderators": [name for name in os.environ.get("MODERATORS", "").split(",") if name],
+        })
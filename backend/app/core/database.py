@@ -1,16 +1,140 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import declarative_base, sessionmaker
+import itertools
+import os
+import re
+from typing import Sequence
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncConnection
+from sqlalchemy.orm import declarative_base, sessionmaker, Session
 
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./sql_app.db"
 
-engine = create_async_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "alembic", "versions")
+
+def set_sqlite_pragma(dbapi_connection, connection_record):
+    # WAL lets several worker processes read while one writes; busy_timeout
+    # makes concurrent writers wait for the lock instead of failing
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    # SQLite ignores foreign keys, and so their ON DELETE CASCADE, unless
+    # asked per connection
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+def set_sqlite_read_pragma(dbapi_connection, connection_record):
+    # Read engines must never write, even when pointed at the primary file
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+def create_engine(url: str, read_only: bool = False):
+    new_engine = create_async_engine(url, connect_args={"check_same_thread": False})
+    pragma = set_sqlite_read_pragma if read_only else set_sqlite_pragma
+    event.listen(new_engine.sync_engine, "connect", pragma)
+    return new_engine
+
+# Cookie set after a successful write; while present, reads go to the
+# primary so users always see their own votes and suggestions
+PRIMARY_PIN_COOKIE = "primary_pin"
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+read_engines = []
+ReadSessionLocals = []
+_next_read_session = None
 Base = declarative_base()
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
+def configure(url: str, read_urls: Sequence[str] = ()) -> None:
+    global engine, AsyncSessionLocal, read_engines, ReadSessionLocals, _next_read_session
+    if url != engine.url.render_as_string(hide_password=False):
+        engine = create_engine(url)
+        AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    read_engines = [create_engine(read_url, read_only=True) for read_url in read_urls]
+    ReadSessionLocals = [
+        sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+        for read_engine in read_engines
+    ]
+    _next_read_session = itertools.cycle(ReadSessionLocals) if ReadSessionLocals else None
+
+def all_engines() -> list:
+    return [engine] + read_engines
+
+async def warm_pool() -> None:
+    # Check out every pooled connection at once so each one gets opened now
+    # rather than on the request that first needs it
+    connections = []
+    try:
+        for pooled_engine in all_engines():
+            # In-memory databases get a StaticPool: one shared connection
+            size = pooled_engine.pool.size() if hasattr(pooled_engine.pool, "size") else 1
+            for _ in range(size):
+                connection = await pooled_engine.connect()
+                connections.append(connection)
+                await connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            await connection.close()
+
+def migration_heads() -> set:
+    # Read revision ids straight from the version scripts; importing alembic
+    # and executing every script costs more than the rest of startup
+    revisions, parents = set(), set()
+    for name in os.listdir(MIGRATIONS_DIR):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(MIGRATIONS_DIR, name)) as f:
+            source = f.read()
+        revision = re.search(r"^revision(?::[^=]*)? = ['\"](\w+)['\"]", source, re.M)
+        down_revision = re.search(r"^down_revision(?::[^=]*)? = (.*)$", source, re.M)
+        if revision:
+            revisions.add(revision.group(1))
+        if down_revision:
+            parents.update(re.findall(r"['\"](\w+)['\"]", down_revision.group(1)))
+    return revisions - parents
+
+async def check_migrations(connection: AsyncConnection) -> None:
+    heads = migration_heads()
+    try:
+        result = await connection.execute(text("SELECT version_num FROM alembic_version"))
+        current = {row[0] for row in result}
+    except OperationalError:
+        current = set()
+
+    if current != heads:
+        raise RuntimeError(
+            f"Database is at revision {sorted(current) or 'none'}, expected {sorted(heads)}; "
+            "run `alembic upgrade head`"
+        )
+
+def _raise_on_lazy_load(orm_execute_state) -> None:
+    if orm_execute_state.is_select and orm_execute_state.lazy_loaded_from is not None:
+        raise RuntimeError(
+            f"Lazy load from {orm_execute_state.lazy_loaded_from.class_.__name__} inside a request; "
+            "query the relationship explicitly instead"
+        )
+
+def guard_lazy_loads(enabled: bool = True) -> None:
+    """Make any relationship lazy load raise. Meant for the test suite."""
+    if enabled and not event.contains(Session, "do_orm_execute", _raise_on_lazy_load):
+        event.listen(Session, "do_orm_execute", _raise_on_lazy_load)
+    elif not enabled and event.contains(Session, "do_orm_execute", _raise_on_lazy_load):
+        event.remove(Session, "do_orm_execute", _raise_on_lazy_load)
+
+def session_factory_for(request: Request):
+    if (
+        _next_read_session is not None
+        and request.method in ("GET", "HEAD")
+        and PRIMARY_PIN_COOKIE not in request.cookies
+    ):
+        return next(_next_read_session)
+    return AsyncSessionLocal
+
+async def get_db(request: Request):
+    async with session_factory_for(request)() as session:
         try:
             yield session
         finally:
@@ -0,0 +1,163 @@
+import hashlib
+import random
+import re
+import struct
+from array import array
+from typing import List, Optional
+from sqlalchemy import select, and_, or_
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.suggestion import Suggestion
+from app.models.duplicate_index import SuggestionMinHash, SuggestionLSHBucket
+
+SHINGLE_SIZE = 4
+BANDS = 16
+ROWS_PER_BAND = 4
+NUM_PERM = BANDS * ROWS_PER_BAND
+# With 16 bands of 4 rows, pairs above ~0.5 Jaccard similarity almost always
+# share a bucket and pairs below ~0.3 rarely do
+DEFAULT_THRESHOLD = 0.5
+MAX_CANDIDATES = 200
+BACKFILL_BATCH_SIZE = 500
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1337)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+
+def shingles(text: str) -> set:
+    normalized = " ".join(re.sub(r"[^\w]+", " ", text.lower()).split())
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(title: str, description: str) -> Optional[array]:
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "little")
+        for shingle in shingles(f"{title} {description}")
+    ]
+    if not hashes:
+        return None
+    return array("I", (
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes) & 0xFFFFFFFF
+        for a, b in _PERMUTATIONS
+    ))
+
+
+def band_buckets(signature: array) -> List[tuple]:
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f"<{ROWS_PER_BAND}I", *rows), digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, "little", signed=True)))
+    return buckets
+
+
+def similarity(left: array, right: array) -> float:
+    return sum(1 for a, b in zip(left, right) if a == b) / NUM_PERM
+
+
+async def index_suggestion(db: AsyncSession, suggestion_id: int, title: str, description: str) -> None:
+    signature = minhash_signature(title, description)
+    if signature is None:
+        return
+    await db.execute(
+        insert(SuggestionMinHash)
+        .values(suggestion_id=suggestion_id, signature=signature.tobytes())
+        .on_conflict_do_nothing()
+    )
+    await db.execute(
+        insert(SuggestionLSHBucket).on_conflict_do_nothing(),
+        [
+            {"band": band, "bucket": bucket, "suggestion_id": suggestion_id}
+            for band, bucket in band_buckets(signature)
+        ]
+    )
+
+
+async def find_duplicates(
+    db: AsyncSession,
+    title: str,
+    description: str,
+    limit: int = 5,
+    threshold: float = DEFAULT_THRESHOLD
+) -> List[dict]:
+    """Return indexed suggestions whose estimated Jaccard similarity is above threshold.
+
+    Only suggestions sharing at least one LSH bucket are compared, so the cost
+    depends on the number of near matches rather than on the table size.
+    """
+    signature = minhash_signature(title, description)
+    if signature is None:
+        return []
+
+    # Spelled as an OR of equalities so SQLite probes the primary key once per
+    # band; with a row-value IN it prefers scanning the suggestion_id index
+    in_any_bucket = or_(*[
+        and_(SuggestionLSHBucket.band == band, SuggestionLSHBucket.bucket == bucket)
+        for band, bucket in band_buckets(signature)
+    ])
+    candidates = await db.execute(
+        select(SuggestionLSHBucket.suggestion_id)
+        .where(in_any_bucket)
+        .distinct()
+        .limit(MAX_CANDIDATES)
+    )
+    candidate_ids = candidates.scalars().all()
+    if not candidate_ids:
+        return []
+
+    result = await db.execute(
+        select(SuggestionMinHash.suggestion_id, SuggestionMinHash.signature)
+        .where(SuggestionMinHash.suggestion_id.in_(candidate_ids))
+    )
+    scored = []
+    for suggestion_id, stored in result.all():
+        score = similarity(signature, array("I", stored))
+        if score >= threshold:
+            scored.append((score, suggestion_id))
+    scored.sort(reverse=True)
+    scored = scored[:limit]
+    if not scored:
+        return []
+
+    result = await db.execute(
+        select(Suggestion.id, Suggestion.title).where(Suggestion.id.in_([i for _, i in scored]))
+    )
+    titles = dict(result.all())
+    return [
+        {"id": suggestion_id, "title": titles[suggestion_id], "similarity": score}
+        for score, suggestion_id in scored
+        if suggestion_id in titles
+    ]
+
+
+async def backfill_index(session_factory) -> int:
+    # Index suggestions created before the duplicate index existed
+    last_id = 0
+    indexed = 0
+    try:
+        while True:
+            async with session_factory() as session:
+                result = await session.execute(
+                    select(Suggestion.id, Suggestion.title, Suggestion.description)
+                    .outerjoin(SuggestionMinHash, SuggestionMinHash.suggestion_id == Suggestion.id)
+                    .where(Suggestion.id > last_id, SuggestionMinHash.suggestion_id.is_(None))
+                    .order_by(Suggestion.id)
+                    .limit(BACKFILL_BATCH_SIZE)
+                )
+                rows = result.all()
+                if not rows:
+                    break
+                for suggestion_id, title, description in rows:
+                    await index_suggestion(session, suggestion_id, title or "", description or "")
+                await session.commit()
+                last_id = rows[-1][0]
+                indexed += len(rows)
+    except Exception as e:
+        print(f"Duplicate index backfill failed: {str(e)}")
+    return indexed
@@ -0,0 +1,207 @@
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import database
+from app.core.invalidation import invalidation_bus, SUGGESTIONS
+from app.models.suggestion import Suggestion, suggestion_likes, suggestion_dislikes
+
+_ID_MASK = 0xFFFFFFFF
+
+
+def rank_key(suggestion_id: int, likes: int, dislikes: int) -> int:
+    # Ascending order of the key is descending net score, newest first on ties
+    return ((dislikes - likes) << 32) | (_ID_MASK - suggestion_id)
+
+
+def id_from_rank_key(key: int) -> int:
+    return _ID_MASK - (key & _ID_MASK)
+
+
+class FeedIndex:
+    """Columnar in-process copy of the feed's ranking data.
+
+    Holds id, author, likes and dislikes for every suggestion in parallel
+    arrays sorted by id, plus the same ids ordered by net score and per-author
+    id lists, so any sorted or author-filtered page is a slice. Only the text
+    of the suggestions on the page has to come from the database.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self._clear()
+
+    def _clear(self) -> None:
+        self.ids = array("q")
+        self.authors = array("q")
+        self.likes = array("i")
+        self.dislikes = array("i")
+        self.ranked = array("q")
+        self.by_author: Dict[int, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _position(self, suggestion_id: int) -> Optional[int]:
+        pos = bisect_left(self.ids, suggestion_id)
+        if pos < len(self.ids) and self.ids[pos] == suggestion_id:
+            return pos
+        return None
+
+    def load(self, rows) -> None:
+        """Bulk load ``(id, author_id, likes, dislikes)`` rows sorted by id."""
+        self._clear()
+        by_author: Dict[int, List[int]] = {}
+        keys = []
+        for suggestion_id, author_id, likes, dislikes in rows:
+            self.ids.append(suggestion_id)
+            self.authors.append(author_id)
+            self.likes.append(likes)
+            self.dislikes.append(dislikes)
+            keys.append(rank_key(suggestion_id, likes, dislikes))
+            by_author.setdefault(author_id, []).append(suggestion_id)
+        keys.sort()
+        self.ranked = array("q", keys)
+        self.by_author = {author_id: array("q", ids) for author_id, ids in by_author.items()}
+        self.loaded = True
+
+    def add(self, suggestion_id: int, author_id: int, likes: int = 0, dislikes: int = 0) -> None:
+        if self._position(suggestion_id) is not None:
+            self.set_counts(suggestion_id, likes, dislikes)
+            return
+        pos = bisect_left(self.ids, suggestion_id)
+        self.ids.insert(pos, suggestion_id)
+        self.authors.insert(pos, author_id)
+        self.likes.insert(pos, likes)
+        self.dislikes.insert(pos, dislikes)
+        insort(self.ranked, rank_key(suggestion_id, likes, dislikes))
+        insort(self.by_author.setdefault(author_id, array("q")), suggestion_id)
+
+    def remove(self, suggestion_id: int) -> None:
+        pos = self._position(suggestion_id)
+        if pos is None:
+            return
+        author_id = self.authors[pos]
+        key = rank_key(suggestion_id, self.likes[pos], self.dislikes[pos])
+        del self.ranked[bisect_left(self.ranked, key)]
+        del self.ids[pos]
+        del self.authors[pos]
+        del self.likes[pos]
+        del self.dislikes[pos]
+
+        authored = self.by_author[author_id]
+        del authored[bisect_left(authored, suggestion_id)]
+        if not authored:
+            del self.by_author[author_id]
+
+    def set_counts(self, suggestion_id: int, likes: int, dislikes: int) -> None:
+        pos = self._position(suggestion_id)
+        if pos is None:
+            return
+        old_key = rank_key(suggestion_id, self.likes[pos], self.dislikes[pos])
+        del self.ranked[bisect_left(self.ranked, old_key)]
+        insort(self.ranked, rank_key(suggestion_id, likes, dislikes))
+        self.likes[pos] = likes
+        self.dislikes[pos] = dislikes
+
+    def row(self, suggestion_id: int) -> Optional[Tuple[int, int, int, int]]:
+        pos = self._position(suggestion_id)
+        if pos is None:
+            return None
+        return suggestion_id, self.authors[pos], self.likes[pos], self.dislikes[pos]
+
+    def page(
+        self,
+        skip: int,
+        limit: int,
+        sort: str = "oldest",
+        user_id: Optional[int] = None
+    ) -> Tuple[int, List[Tuple[int, int, int, int]]]:
+        skip = max(skip, 0)
+        limit = max(limit, 0)
+        if user_id is not None:
+            ids = self.by_author.get(user_id, array("q"))
+            total = len(ids)
+            if sort == "top":
+                ordered = sorted(ids, key=lambda i: rank_key(i, *self.row(i)[2:]))
+                page_ids = ordered[skip:skip + limit]
+            elif sort == "newest":
+                page_ids = ids[::-1][skip:skip + limit]
+            else:
+                page_ids = ids[skip:skip + limit]
+        else:
+            total = len(self.ids)
+            if sort == "top":
+                page_ids = [id_from_rank_key(key) for key in self.ranked[skip:skip + limit]]
+            elif sort == "newest":
+                end = max(total - skip, 0)
+                page_ids = self.ids[max(end - limit, 0):end][::-1]
+            else:
+                page_ids = self.ids[skip:skip + limit]
+        return total, [self.row(suggestion_id) for suggestion_id in page_ids]
+
+    def memory_bytes(self) -> int:
+        columns = [self.ids, self.authors, self.likes, self.dislikes, self.ranked]
+        columns.extend(self.by_author.values())
+        return sum(column.buffer_info()[1] * column.itemsize for column in columns)
+
+
+async def load_feed_index(index: FeedIndex, db: AsyncSession) -> None:
+    likes = (
+        select(suggestion_likes.c.suggestion_id, func.count().label("n"))
+        .group_by(suggestion_likes.c.suggestion_id)
+        .subquery()
+    )
+    dislikes = (
+        select(suggestion_dislikes.c.suggestion_id, func.count().label("n"))
+        .group_by(suggestion_dislikes.c.suggestion_id)
+        .subquery()
+    )
+    result = await db.stream(
+        select(
+            Suggestion.id,
+            func.coalesce(Suggestion.user_id, 0),
+            func.coalesce(likes.c.n, 0),
+            func.coalesce(dislikes.c.n, 0)
+        )
+        .outerjoin(likes, likes.c.suggestion_id == Suggestion.id)
+        .outerjoin(dislikes, dislikes.c.suggestion_id == Suggestion.id)
+        .order_by(Suggestion.id)
+        .execution_options(yield_per=10000)
+    )
+    rows = []
+    async for partition in result.partitions():
+        rows.extend(partition)
+    index.load(rows)
+
+
+async def refresh_suggestion(index: FeedIndex, db: AsyncSession, suggestion_id: int) -> None:
+    # Re-read one suggestion after another worker changed it
+    result = await db.execute(select(Suggestion.user_id).where(Suggestion.id == suggestion_id))
+    row = result.first()
+    if row is None:
+        index.remove(suggestion_id)
+        return
+    author_id = row[0] or 0
+    likes = await db.execute(
+        select(func.count()).select_from(suggestion_likes).where(suggestion_likes.c.suggestion_id == suggestion_id)
+    )
+    dislikes = await db.execute(
+        select(func.count()).select_from(suggestion_dislikes).where(suggestion_dislikes.c.suggestion_id == suggestion_id)
+    )
+    index.add(suggestion_id, author_id)
+    index.set_counts(suggestion_id, likes.scalar_one(), dislikes.scalar_one())
+
+
+feed_index = FeedIndex()
+
+
+async def _on_suggestion_changed(key: str) -> None:
+    if not feed_index.loaded:
+        return
+    async with database.AsyncSessionLocal() as session:
+        await refresh_suggestion(feed_index, session, int(key))
+
+
+invalidation_bus.subscribe(SUGGESTIONS, _on_suggestion_changed)
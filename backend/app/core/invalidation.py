@@ -0,0 +1,89 @@
+import asyncio
+import inspect
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.cache_invalidation import CacheInvalidation
+
+SUGGESTIONS = "suggestions"
+REVOKED_TOKENS = "revoked_tokens"
+
+
+class InvalidationBus:
+    """Cross-worker cache invalidation over a SQLite change-log table.
+
+    Writers append ``(topic, key)`` rows in the same transaction as their change;
+    every worker polls the table and hands new rows to the handlers subscribed
+    to that topic (plain functions or coroutines). A worker sees another
+    worker's change within ``poll_interval`` seconds. With a single worker the
+    bus is disabled and publishing is a no-op.
+    """
+
+    def __init__(self, enabled: bool, poll_interval: float = 0.5, retention: float = 60.0):
+        self.enabled = enabled
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.origin = os.getpid()
+        self._handlers: Dict[str, List[Callable[[str], None]]] = defaultdict(list)
+        self._last_id = 0
+
+    def subscribe(self, topic: str, handler: Callable[[str], None]) -> None:
+        self._handlers[topic].append(handler)
+
+    def publish(self, db: AsyncSession, topic: str, key) -> None:
+        # Joins the caller's transaction; nothing is sent until it commits
+        if not self.enabled:
+            return
+        db.add(CacheInvalidation(
+            topic=topic,
+            key=str(key),
+            origin=self.origin,
+            created_at=datetime.utcnow()
+        ))
+
+    async def start(self, db: AsyncSession) -> None:
+        self.origin = os.getpid()
+        result = await db.execute(select(func.max(CacheInvalidation.id)))
+        self._last_id = result.scalar_one() or 0
+
+    async def poll(self, db: AsyncSession) -> int:
+        result = await db.execute(
+            select(CacheInvalidation.id, CacheInvalidation.topic, CacheInvalidation.key, CacheInvalidation.origin)
+            .where(CacheInvalidation.id > self._last_id)
+            .order_by(CacheInvalidation.id)
+        )
+        rows = result.all()
+        for row_id, topic, key, origin in rows:
+            self._last_id = row_id
+            if origin == self.origin:
+                continue
+            for handler in self._handlers.get(topic, ()):
+                outcome = handler(key)
+                if inspect.isawaitable(outcome):
+                    await outcome
+        return len(rows)
+
+    async def prune(self, db: AsyncSession) -> None:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention)
+        await db.execute(delete(CacheInvalidation).where(CacheInvalidation.created_at < cutoff))
+        await db.commit()
+
+    async def run(self, session_factory) -> None:
+        polls_per_prune = max(int(self.retention / self.poll_interval), 1)
+        polls = 0
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                async with session_factory() as session:
+                    await self.poll(session)
+                    polls += 1
+                    if polls % polls_per_prune == 0:
+                        await self.prune(session)
+            except Exception as e:
+                print(f"Invalidation poll failed: {str(e)}")
+
+
+invalidation_bus = InvalidationBus(enabled=False)
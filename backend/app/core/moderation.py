@@ -0,0 +1,302 @@
+import asyncio
+import time
+from collections import Counter
+from typing import List, Optional
+from sqlalchemy import select, delete, func, Table
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import database
+from app.core.archive import move_to_archive, restore_hidden
+from app.core.invalidation import invalidation_bus, SUGGESTIONS
+from app.core.feed_index import feed_index
+from app.core.rollups import record_vote_event, LIKE, DISLIKE
+from app.core.user_stats import update_user_stats
+from app.core.vote_counts import vote_count_cache
+from app.models.suggestion import Suggestion, suggestion_likes, suggestion_dislikes
+from app.models.archive import ArchivedSuggestion, archived_suggestion_likes, archived_suggestion_dislikes
+from app.models.vote_event import VoteEvent, HourlyVoteRollup, DailyVoteRollup
+
+# Each chunk is one write transaction. Its size adapts so that the write lock
+# is held for about CHUNK_TARGET_SECONDS, whatever the rows cost to delete
+CHUNK_TARGET_SECONDS = 0.05
+INITIAL_CHUNK_SIZE = 200
+MIN_CHUNK_SIZE = 10
+MAX_CHUNK_SIZE = 5000
+
+
+async def delete_suggestions(db: AsyncSession, suggestion_ids: List[int], author_id: Optional[int] = None) -> int:
+    """Delete suggestions (and, by cascade, their votes) in one statement.
+
+    Keeps the authors' stats, the vote count cache and the feed index in step.
+    With ``author_id`` only that user's suggestions are touched. Commits and
+    returns the number deleted.
+    """
+    likes = (
+        select(func.count()).select_from(suggestion_likes)
+        .where(suggestion_likes.c.suggestion_id == Suggestion.id)
+        .scalar_subquery()
+    )
+    dislikes = (
+        select(func.count()).select_from(suggestion_dislikes)
+        .where(suggestion_dislikes.c.suggestion_id == Suggestion.id)
+        .scalar_subquery()
+    )
+    query = select(Suggestion.id, Suggestion.user_id, likes, dislikes).where(Suggestion.id.in_(suggestion_ids))
+    if author_id is not None:
+        query = query.where(Suggestion.user_id == author_id)
+    result = await db.execute(query)
+    rows = result.all()
+    if not rows:
+        await db.rollback()
+        return 0
+
+    per_author = {}
+    for _, user_id, likes_count, dislikes_count in rows:
+        totals = per_author.setdefault(user_id, [0, 0, 0])
+        totals[0] += 1
+        totals[1] += likes_count
+        totals[2] += dislikes_count
+    for user_id, (count, likes_count, dislikes_count) in per_author.items():
+        if user_id is not None:
+            await update_user_stats(db, user_id, suggestions=-count, likes=-likes_count, dislikes=-dislikes_count)
+
+    ids = [row[0] for row in rows]
+    await db.execute(delete(Suggestion).where(Suggestion.id.in_(ids)))
+    for suggestion_id in ids:
+        invalidation_bus.publish(db, SUGGESTIONS, suggestion_id)
+    await db.commit()
+
+    for suggestion_id in ids:
+        vote_count_cache.forget(suggestion_id)
+        if feed_index.loaded:
+            feed_index.remove(suggestion_id)
+    return len(ids)
+
+
+async def delete_archived_suggestions(db: AsyncSession, suggestion_ids: List[int], author_id: Optional[int] = None) -> int:
+    """Delete archived (and hidden) suggestions with their votes and vote history.
+
+    Archived suggestions still count towards their authors' stats, so those
+    are kept in step. With ``author_id`` only that user's suggestions are
+    touched. Commits and returns the number deleted.
+    """
+    likes = (
+        select(func.count()).select_from(archived_suggestion_likes)
+        .where(archived_suggestion_likes.c.suggestion_id == ArchivedSuggestion.id)
+        .scalar_subquery()
+    )
+    dislikes = (
+        select(func.count()).select_from(archived_suggestion_dislikes)
+        .where(archived_suggestion_dislikes.c.suggestion_id == ArchivedSuggestion.id)
+        .scalar_subquery()
+    )
+    query = (
+        select(ArchivedSuggestion.id, ArchivedSuggestion.user_id, likes, dislikes)
+        .where(ArchivedSuggestion.id.in_(suggestion_ids))
+    )
+    if author_id is not None:
+        query = query.where(ArchivedSuggestion.user_id == author_id)
+    result = await db.execute(query)
+    rows = result.all()
+    if not rows:
+        await db.rollback()
+        return 0
+
+    per_author = {}
+    for _, user_id, likes_count, dislikes_count in rows:
+        totals = per_author.setdefault(user_id, [0, 0, 0])
+        totals[0] += 1
+        totals[1] += likes_count
+        totals[2] += dislikes_count
+    for user_id, (count, likes_count, dislikes_count) in per_author.items():
+        if user_id is not None:
+            await update_user_stats(db, user_id, suggestions=-count, likes=-likes_count, dislikes=-dislikes_count)
+
+    ids = [row[0] for row in rows]
+    await db.execute(delete(archived_suggestion_likes).where(archived_suggestion_likes.c.suggestion_id.in_(ids)))
+    await db.execute(delete(archived_suggestion_dislikes).where(archived_suggestion_dislikes.c.suggestion_id.in_(ids)))
+    await db.execute(delete(ArchivedSuggestion).where(ArchivedSuggestion.id.in_(ids)))
+    # Their vote history goes too, so nothing is left filed under the ids
+    for history in (VoteEvent, HourlyVoteRollup, DailyVoteRollup):
+        await db.execute(delete(history).where(history.suggestion_id.in_(ids)))
+    await db.commit()
+    return len(ids)
+
+
+async def remove_user_votes(db: AsyncSession, table: Table, kind: str, user_id: int, limit: int) -> int:
+    """Withdraw up to ``limit`` of a user's votes from ``table``. Commits and returns how many."""
+    result = await db.execute(
+        select(table.c.suggestion_id, Suggestion.user_id)
+        .join(Suggestion, Suggestion.id == table.c.suggestion_id)
+        .where(table.c.user_id == user_id)
+        .limit(limit)
+    )
+    rows = result.all()
+    if not rows:
+        await db.rollback()
+        return 0
+
+    ids = [suggestion_id for suggestion_id, _ in rows]
+    authors = Counter(author_id for _, author_id in rows if author_id is not None)
+    for author_id, count in authors.items():
+        if kind == LIKE:
+            await update_user_stats(db, author_id, likes=-count)
+        else:
+            await update_user_stats(db, author_id, dislikes=-count)
+    # Compensating events keep trending windows consistent with the votes
+    for suggestion_id in ids:
+        record_vote_event(db, suggestion_id, user_id, kind, -1)
+        invalidation_bus.publish(db, SUGGESTIONS, suggestion_id)
+    await db.execute(delete(table).where(table.c.user_id == user_id, table.c.suggestion_id.in_(ids)))
+    await db.commit()
+
+    for suggestion_id in ids:
+        if kind == LIKE:
+            vote_count_cache.apply(suggestion_id, likes=-1)
+        else:
+            vote_count_cache.apply(suggestion_id, dislikes=-1)
+        row = feed_index.row(suggestion_id) if feed_index.loaded else None
+        if row is not None:
+            _, _, likes, dislikes = row
+            if kind == LIKE:
+                feed_index.set_counts(suggestion_id, likes - 1, dislikes)
+            else:
+                feed_index.set_counts(suggestion_id, likes, dislikes - 1)
+    return len(ids)
+
+
+async def remove_archived_user_votes(db: AsyncSession, table: Table, kind: str, user_id: int, limit: int) -> int:
+    """Withdraw up to ``limit`` of a user's votes on archived suggestions. Commits and returns how many."""
+    result = await db.execute(
+        select(table.c.suggestion_id, ArchivedSuggestion.user_id)
+        .join(ArchivedSuggestion, ArchivedSuggestion.id == table.c.suggestion_id)
+        .where(table.c.user_id == user_id)
+        .limit(limit)
+    )
+    rows = result.all()
+    if not rows:
+        await db.rollback()
+        return 0
+
+    # Archived suggestions are out of the feed, the cache and trending, so
+    # only the authors' stats need to follow
+    ids = [suggestion_id for suggestion_id, _ in rows]
+    authors = Counter(author_id for _, author_id in rows if author_id is not None)
+    for author_id, count in authors.items():
+        if kind == LIKE:
+            await update_user_stats(db, author_id, likes=-count)
+        else:
+            await update_user_stats(db, author_id, dislikes=-count)
+    await db.execute(delete(table).where(table.c.user_id == user_id, table.c.suggestion_id.in_(ids)))
+    await db.commit()
+    return len(ids)
+
+
+async def run_in_chunks(step, phase: str, session_factory=None):
+    """Call ``step(session, limit)`` until it returns 0, yielding progress after each chunk.
+
+    A failing chunk is rolled back and reported as ``{"phase", "error"}``,
+    which is the last update yielded.
+    """
+    session_factory = session_factory or database.AsyncSessionLocal
+    chunk_size = INITIAL_CHUNK_SIZE
+    processed = 0
+    chunks = 0
+    while True:
+        started = time.perf_counter()
+        try:
+            async with session_factory() as session:
+                done = await step(session, chunk_size)
+        except Exception as e:
+            print(f"Moderation {phase} failed: {str(e)}")
+            yield {"phase": phase, "error": str(e)}
+            return
+        elapsed = time.perf_counter() - started
+        if done == 0:
+            return
+        processed += done
+        chunks += 1
+        yield {"phase": phase, "chunk": chunks, "processed": processed, "chunk_ms": round(elapsed * 1000, 1)}
+
+        if elapsed > CHUNK_TARGET_SECONDS:
+            chunk_size = max(MIN_CHUNK_SIZE, chunk_size // 2)
+        elif elapsed < CHUNK_TARGET_SECONDS / 2:
+            chunk_size = min(MAX_CHUNK_SIZE, chunk_size * 2)
+        # Give other writers a turn at the database between chunks
+        await asyncio.sleep(0)
+
+
+def over_ids(suggestion_ids: List[int], apply):
+    # Turn "apply to these ids, returning how many rows it changed" into a
+    # chunk step over a fixed list. Chunks that change nothing are skipped
+    # rather than ending the run, so progress counts only real changes
+    remaining = sorted(set(suggestion_ids))
+
+    async def step(db: AsyncSession, limit: int) -> int:
+        while remaining:
+            chunk = remaining[:limit]
+            del remaining[:limit]
+            done = await apply(db, chunk)
+            if done:
+                return done
+        return 0
+    return step
+
+
+def delete_many(suggestion_ids: List[int]):
+    async def delete_anywhere(db: AsyncSession, chunk: List[int]) -> int:
+        # Hidden and archived suggestions are deleted from the archive tables
+        deleted = await delete_suggestions(db, chunk)
+        return deleted + await delete_archived_suggestions(db, chunk)
+    return run_in_chunks(over_ids(suggestion_ids, delete_anywhere), "delete")
+
+
+def hide_many(suggestion_ids: List[int]):
+    async def hide(db: AsyncSession, chunk: List[int]) -> int:
+        return len(await move_to_archive(db, Suggestion.id.in_(chunk), hidden=True))
+    return run_in_chunks(over_ids(suggestion_ids, hide), "hide")
+
+
+def unhide_many(suggestion_ids: List[int]):
+    async def unhide(db: AsyncSession, chunk: List[int]) -> int:
+        return len(await restore_hidden(db, chunk))
+    return run_in_chunks(over_ids(suggestion_ids, unhide), "unhide")
+
+
+async def purge_user_content(user_id: int):
+    """Delete every suggestion by ``user_id`` and withdraw all of their votes, archived ones included."""
+    async def suggestions_step(db: AsyncSession, limit: int) -> int:
+        result = await db.execute(
+            select(Suggestion.id).where(Suggestion.user_id == user_id).order_by(Suggestion.id).limit(limit)
+        )
+        ids = result.scalars().all()
+        if not ids:
+            return 0
+        return await delete_suggestions(db, ids, author_id=user_id)
+
+    async def archived_step(db: AsyncSession, limit: int) -> int:
+        result = await db.execute(
+            select(ArchivedSuggestion.id).where(ArchivedSuggestion.user_id == user_id).limit(limit)
+        )
+        ids = result.scalars().all()
+        if not ids:
+            return 0
+        return await delete_archived_suggestions(db, ids, author_id=user_id)
+
+    def votes_step(remove, table: Table, kind: str):
+        async def step(db: AsyncSession, limit: int) -> int:
+            return await remove(db, table, kind, user_id, limit)
+        return step
+
+    phases = [
+        (suggestions_step, "suggestions"),
+        (archived_step, "archived"),
+        (votes_step(remove_user_votes, suggestion_likes, LIKE), "likes"),
+        (votes_step(remove_user_votes, suggestion_dislikes, DISLIKE), "dislikes"),
+        (votes_step(remove_archived_user_votes, archived_suggestion_likes, LIKE), "archived likes"),
+        (votes_step(remove_archived_user_votes, archived_suggestion_dislikes, DISLIKE), "archived dislikes"),
+    ]
+    for step, phase in phases:
+        async for progress in run_in_chunks(step, phase):
+            yield progress
+            if "error" in progress:
+                return
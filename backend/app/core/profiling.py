@@ -0,0 +1,284 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+from fastapi import FastAPI
+from sqlalchemy import event
+
+PROFILE_HEADER = b"x-profile"
+SAMPLE_INTERVAL = 0.001
+IDLE_STACK = "(event loop idle)"
+
+_current_profile: contextvars.ContextVar = contextvars.ContextVar("current_profile", default=None)
+
+
+class RequestProfile:
+    """Samples the event-loop thread while one request runs.
+
+    The loop thread is shared by every request in flight, so only samples
+    taken while the profiled request's task, or a task it started, is
+    running are kept. Samples from other requests are only counted, and
+    samples of an idle loop are kept as a single ``IDLE_STACK`` frame.
+    Work the request hands to the thread pool is not sampled.
+    """
+
+    def __init__(self, thread_id: int, loop, task, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.loop = loop
+        self.tasks = weakref.WeakSet([task])
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.other_task_samples = 0
+        self.sql = []
+        self.dependencies = []
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            running = asyncio.current_task(self.loop)
+            if running is None:
+                self.stacks[IDLE_STACK] += 1
+                continue
+            if running not in self.tasks:
+                self.other_task_samples += 1
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._sampler.join()
+
+    def collapsed(self) -> str:
+        # Brendan Gregg's collapsed-stack format; speedscope imports it directly
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfilingMiddleware:
+    """Runs selected requests under a sampling profiler and dumps the result.
+
+    A request is profiled when it carries ``X-Profile: <token>`` matching the
+    configured admin token, or when it falls within the sampling rate. Each
+    profile is written to ``output_dir`` as a collapsed-stack file plus a JSON
+    file with the route, SQL statement timings and dependency timings.
+    """
+
+    def __init__(
+        self,
+        app,
+        output_dir: str,
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        instrumentation: Optional["Instrumentation"] = None
+    ):
+        self.app = app
+        self.output_dir = output_dir
+        self.instrumentation = instrumentation
+        self.token = token.encode() if token else None
+        self.sample_rate = sample_rate
+
+    def _wants_profile(self, scope) -> bool:
+        if self.token is not None:
+            for name, value in scope.get("headers", ()):
+                if name == PROFILE_HEADER and value == self.token:
+                    return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status = {}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        profile = RequestProfile(threading.get_ident(), asyncio.get_running_loop(), asyncio.current_task())
+        token = _current_profile.set(profile)
+        if self.instrumentation is not None:
+            self.instrumentation.acquire()
+        started = time.perf_counter()
+        profile.start()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            profile.stop()
+            if self.instrumentation is not None:
+                self.instrumentation.release()
+            _current_profile.reset(token)
+            try:
+                self._dump(scope, profile, status.get("code"), time.perf_counter() - started)
+            except OSError as e:
+                print(f"Writing request profile failed: {str(e)}")
+
+    def _dump(self, scope, profile: RequestProfile, status: Optional[int], duration: float) -> None:
+        route = scope.get("route")
+        route_path = getattr(route, "path", scope["path"])
+        slug = re.sub(r"[^\w]+", "_", route_path).strip("_") or "root"
+        name = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{scope['method']}-{slug}"
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, name + ".collapsed"), "w") as f:
+            f.write(profile.collapsed())
+        with open(os.path.join(self.output_dir, name + ".json"), "w") as f:
+            json.dump({
+                "method": scope["method"],
+                "route": route_path,
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode(),
+                "status": status,
+                "duration_ms": duration * 1000,
+                "sample_interval_ms": profile.interval * 1000,
+                "samples": sum(profile.stacks.values()),
+                "other_task_samples": profile.other_task_samples,
+                "sql": profile.sql,
+                "dependencies": profile.dependencies,
+            }, f, indent=2)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None or not conn.info.get("profile_started"):
+        return
+    started = conn.info["profile_started"].pop()
+    profile.sql.append({
+        "statement": statement,
+        "duration_ms": (time.perf_counter() - started) * 1000,
+    })
+
+
+def _timed_dependency(call):
+    name = f"{call.__module__}.{call.__qualname__}"
+
+    if inspect.isasyncgenfunction(call):
+        @functools.wraps(call)
+        async def timed_generator(*args, **kwargs):
+            profile = _current_profile.get()
+            started = time.perf_counter()
+            agen = call(*args, **kwargs)
+            value = await agen.__anext__()
+            if profile is not None:
+                profile.dependencies.append({"name": name, "duration_ms": (time.perf_counter() - started) * 1000})
+            try:
+                yield value
+            finally:
+                await agen.aclose()
+        return timed_generator
+
+    @functools.wraps(call)
+    async def timed(*args, **kwargs):
+        profile = _current_profile.get()
+        started = time.perf_counter()
+        try:
+            return await call(*args, **kwargs)
+        finally:
+            if profile is not None:
+                profile.dependencies.append({"name": name, "duration_ms": (time.perf_counter() - started) * 1000})
+    return timed
+
+
+def _route_dependants(app: FastAPI):
+    seen = set()
+    stack = [route.dependant for route in app.routes if hasattr(route, "dependant")]
+    while stack:
+        dependant = stack.pop()
+        for sub in dependant.dependencies:
+            stack.append(sub)
+            if id(sub) in seen:
+                continue
+            seen.add(id(sub))
+            if inspect.iscoroutinefunction(sub.call) or inspect.isasyncgenfunction(sub.call):
+                yield sub
+
+
+def _profiled_task_factory(loop, coro, context=None):
+    # Tasks started by a profiled request count as part of its profile
+    task = asyncio.Task(coro, loop=loop, context=context)
+    profile = context.get(_current_profile) if context is not None else _current_profile.get()
+    if profile is not None:
+        profile.tasks.add(task)
+    return task
+
+
+class Instrumentation:
+    """Timing hooks that are only in place while some request is being profiled.
+
+    Swapping the route dependants' callables (rather than registering
+    ``dependency_overrides``, which make FastAPI rebuild every dependant on
+    every request) means unprofiled requests run the original code whenever
+    no profile is in progress.
+    """
+
+    def __init__(self, app: FastAPI):
+        self.app = app
+        self._dependants = None
+        self._timed = {}
+        self._active = 0
+
+    def acquire(self) -> None:
+        self._active += 1
+        if self._active > 1:
+            return
+        if self._dependants is None:
+            self._dependants = list(_route_dependants(self.app))
+        for dependant in self._dependants:
+            call = dependant.call
+            if call not in self._timed:
+                self._timed[call] = _timed_dependency(call)
+            dependant.call = self._timed[call]
+        loop = asyncio.get_running_loop()
+        if loop.get_task_factory() is None:
+            loop.set_task_factory(_profiled_task_factory)
+
+    def release(self) -> None:
+        self._active -= 1
+        if self._active > 0:
+            return
+        for dependant in self._dependants:
+            dependant.call = dependant.call.__wrapped__
+        loop = asyncio.get_running_loop()
+        if loop.get_task_factory() is _profiled_task_factory:
+            loop.set_task_factory(None)
+
+
+def install_profiling(app: FastAPI, engines, output_dir: str, token: Optional[str], sample_rate: float) -> None:
+    """Wire up request profiling. Nothing is installed unless this is called."""
+    for engine in engines:
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    app.add_middleware(
+        ProfilingMiddleware,
+        output_dir=output_dir,
+        token=token,
+        sample_rate=sample_rate,
+        instrumentation=Instrumentation(app)
+    )
@@ -0,0 +1,83 @@
+import time
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.revoked_token import RevokedToken
+from app.core.invalidation import invalidation_bus, REVOKED_TOKENS
+
+# Expired denylist rows are dropped at most this often (seconds)
+PRUNE_INTERVAL = 300
+
+
+class RevocationStore:
+    """Denylist of revoked JWT ids.
+
+    Every revoked jti is persisted in ``revoked_tokens`` and mirrored in an
+    in-memory dict, so checking a token is one hash lookup and never touches
+    the database. Only unexpired tokens are kept, which bounds the dict.
+    """
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}
+        self._last_prune = time.time()
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return bool(jti) and jti in self._revoked
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self._revoked[jti] = expires_at
+
+    def prune(self, now: Optional[float] = None) -> int:
+        now = now or time.time()
+        expired = [jti for jti, exp in self._revoked.items() if exp <= now]
+        for jti in expired:
+            del self._revoked[jti]
+        self._last_prune = now
+        return len(expired)
+
+    async def load(self, db: AsyncSession) -> None:
+        now = datetime.utcnow()
+        await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        await db.commit()
+
+        result = await db.execute(select(RevokedToken.jti, RevokedToken.expires_at))
+        self._revoked = {
+            jti: _to_timestamp(expires_at) for jti, expires_at in result.all()
+        }
+        self._last_prune = time.time()
+
+    async def revoke(self, db: AsyncSession, jti: str, expires_at: float) -> None:
+        if jti in self._revoked:
+            return
+
+        await db.execute(
+            insert(RevokedToken)
+            .values(jti=jti, expires_at=datetime.utcfromtimestamp(expires_at))
+            .on_conflict_do_nothing()
+        )
+        invalidation_bus.publish(db, REVOKED_TOKENS, f"{jti}:{int(expires_at)}")
+        if time.time() - self._last_prune > PRUNE_INTERVAL:
+            await db.execute(
+                delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow())
+            )
+            self.prune()
+        await db.commit()
+
+        self.add(jti, expires_at)
+
+
+def _to_timestamp(value: datetime) -> float:
+    return (value - datetime(1970, 1, 1)).total_seconds()
+
+
+revocation_store = RevocationStore()
+
+
+def _on_revoked(key: str) -> None:
+    jti, expires_at = key.rsplit(":", 1)
+    revocation_store.add(jti, float(expires_at))
+
+
+invalidation_bus.subscribe(REVOKED_TOKENS, _on_revoked)
@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, delete, func, case
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.vote_event import VoteEvent, HourlyVoteRollup, DailyVoteRollup, VoteRollupCheckpoint
+
+LIKE = "like"
+DISLIKE = "dislike"
+
+# Hourly rows only serve the 1h and 24h windows
+HOURLY_RETENTION = timedelta(days=2)
+
+
+def record_vote_event(db: AsyncSession, suggestion_id: int, user_id: int, kind: str, delta: int) -> None:
+    db.add(VoteEvent(
+        suggestion_id=suggestion_id,
+        user_id=user_id,
+        kind=kind,
+        delta=delta,
+        created_at=datetime.utcnow()
+    ))
+
+
+def _net_votes():
+    likes = func.sum(case((VoteEvent.kind == LIKE, VoteEvent.delta), else_=0))
+    dislikes = func.sum(case((VoteEvent.kind == DISLIKE, VoteEvent.delta), else_=0))
+    return likes, dislikes
+
+
+def votes_between(start: datetime, end: datetime):
+    """Net likes and dislikes per suggestion from the raw events in ``[start, end)``."""
+    likes, dislikes = _net_votes()
+    return (
+        select(VoteEvent.suggestion_id, likes.label("likes"), dislikes.label("dislikes"))
+        .where(VoteEvent.created_at >= start, VoteEvent.created_at < end)
+        .group_by(VoteEvent.suggestion_id)
+    )
+
+
+async def _roll_up(db: AsyncSession, table, bucket_format: str, first_id: int, last_id: int) -> None:
+    bucket = func.strftime(bucket_format, VoteEvent.created_at)
+    likes, dislikes = _net_votes()
+    events = (
+        select(bucket, VoteEvent.suggestion_id, likes, dislikes)
+        .where(VoteEvent.id > first_id, VoteEvent.id <= last_id)
+        .group_by(bucket, VoteEvent.suggestion_id)
+    )
+    statement = insert(table).from_select(
+        ["bucket", "suggestion_id", "likes", "dislikes"], events
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["bucket", "suggestion_id"],
+        set_={
+            "likes": table.likes + statement.excluded.likes,
+            "dislikes": table.dislikes + statement.excluded.dislikes,
+        }
+    )
+    await db.execute(statement)
+
+
+async def compact(db: AsyncSession) -> int:
+    """Fold vote events newer than the checkpoint into the hourly and daily rollups."""
+    await db.execute(
+        insert(VoteRollupCheckpoint).values(id=1, last_event_id=0).on_conflict_do_nothing()
+    )
+    result = await db.execute(select(VoteRollupCheckpoint.last_event_id).where(VoteRollupCheckpoint.id == 1))
+    first_id = result.scalar_one()
+    result = await db.execute(select(func.max(VoteEvent.id)))
+    last_id = result.scalar_one() or 0
+    if last_id <= first_id:
+        await db.rollback()
+        return 0
+
+    # Moving the checkpoint first takes the write lock; if another worker got
+    # there before us the update matches nothing and we leave the work to it
+    claimed = await db.execute(
+        update(VoteRollupCheckpoint)
+        .where(VoteRollupCheckpoint.id == 1, VoteRollupCheckpoint.last_event_id == first_id)
+        .values(last_event_id=last_id)
+    )
+    if claimed.rowcount == 0:
+        await db.rollback()
+        return 0
+
+    await _roll_up(db, HourlyVoteRollup, "%Y-%m-%d %H:00:00.000000", first_id, last_id)
+    await _roll_up(db, DailyVoteRollup, "%Y-%m-%d 00:00:00.000000", first_id, last_id)
+    await db.execute(
+        delete(HourlyVoteRollup).where(HourlyVoteRollup.bucket < datetime.utcnow() - HOURLY_RETENTION)
+    )
+    await db.commit()
+    return last_id - first_id
+
+
+async def run_compactor(session_factory, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as session:
+                await compact(session)
+        except Exception as e:
+            print(f"Vote rollup compaction failed: {str(e)}")
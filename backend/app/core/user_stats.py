@@ -0,0 +1,30 @@
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user_stats import UserStats
+
+
+async def update_user_stats(
+    db: AsyncSession,
+    user_id: int,
+    suggestions: int = 0,
+    likes: int = 0,
+    dislikes: int = 0
+) -> None:
+    """Apply deltas to a user's precomputed statistics in the caller's transaction."""
+    statement = insert(UserStats).values(
+        user_id=user_id,
+        suggestion_count=suggestions,
+        likes_received=likes,
+        dislikes_received=dislikes,
+        score=likes - dislikes
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "suggestion_count": UserStats.suggestion_count + suggestions,
+            "likes_received": UserStats.likes_received + likes,
+            "dislikes_received": UserStats.dislikes_received + dislikes,
+            "score": UserStats.score + (likes - dislikes),
+        }
+    )
+    await db.execute(statement)
@@ -0,0 +1,162 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import database
+from app.core.invalidation import invalidation_bus, SUGGESTIONS
+from app.core.votes import vote_counts
+from app.models.suggestion import suggestion_likes, suggestion_dislikes
+
+
+class VoteCountCache:
+    """Per-suggestion like/dislike counts served stale-while-revalidate.
+
+    Counts older than ``max_staleness`` seconds are still served, but trigger
+    one background recount. Counts older than ``max_age`` are recounted before
+    they are served, so a lost refresh or invalidation cannot keep a number
+    wrong for longer than that. Votes made through this process adjust the
+    cached numbers straight away, so the bounds only matter for votes from
+    other workers and for refreshes that raced a vote. ``strict`` reads always
+    count in the database.
+    """
+
+    def __init__(self, max_staleness: float = 2.0, max_entries: int = 100_000, max_age: float = 30.0):
+        self.max_staleness = max_staleness
+        self.max_age = max_age
+        self.max_entries = max_entries
+        # suggestion_id -> [likes, dislikes, counted_at, expired]
+        self._entries: "OrderedDict[int, list]" = OrderedDict()
+        self._refreshing = set()
+        self._tasks = set()
+        self.reset_metrics()
+
+    def reset_metrics(self) -> None:
+        self.served = 0
+        self.misses = 0
+        self.stale_served = 0
+        self.strict_reads = 0
+        self.refreshes = 0
+        self.staleness_total = 0.0
+        self.staleness_max = 0.0
+
+    def clear(self) -> None:
+        # Refreshes still running would write into the emptied cache through
+        # an engine that is about to be disposed
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        self._entries.clear()
+        self._refreshing.clear()
+
+    def _store(self, suggestion_id: int, likes: int, dislikes: int, counted_at: float) -> None:
+        self._entries[suggestion_id] = [likes, dislikes, counted_at, False]
+        self._entries.move_to_end(suggestion_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _count(self, db: AsyncSession, suggestion_ids) -> Dict[int, Tuple[int, int]]:
+        counted_at = time.monotonic()
+        likes = await vote_counts(db, suggestion_likes, suggestion_ids)
+        dislikes = await vote_counts(db, suggestion_dislikes, suggestion_ids)
+        # Storing can evict, even ids from this same batch when it is larger
+        # than the cache, so the caller gets the counts rather than the entries
+        counts = {i: (likes[i], dislikes[i]) for i in suggestion_ids}
+        for suggestion_id, (likes_count, dislikes_count) in counts.items():
+            self._store(suggestion_id, likes_count, dislikes_count, counted_at)
+        return counts
+
+    async def get(
+        self,
+        db: AsyncSession,
+        suggestion_ids: Iterable[int],
+        strict: bool = False
+    ) -> Dict[int, Tuple[int, int]]:
+        suggestion_ids = list(suggestion_ids)
+        if strict or self.max_staleness <= 0:
+            self.strict_reads += len(suggestion_ids)
+            return await self._count(db, suggestion_ids)
+
+        now = time.monotonic()
+        counts = {}
+        stale = []
+        missing = []
+        for suggestion_id in suggestion_ids:
+            entry = self._entries.get(suggestion_id)
+            if entry is None or now - entry[2] > self.max_age:
+                missing.append(suggestion_id)
+                continue
+            likes, dislikes, counted_at, expired = entry
+            age = max(now - counted_at, 0.0)
+            if age > self.max_staleness:
+                self.stale_served += 1
+            if (expired or age > self.max_staleness) and suggestion_id not in self._refreshing:
+                stale.append(suggestion_id)
+            self.served += 1
+            self.staleness_total += age
+            self.staleness_max = max(self.staleness_max, age)
+            counts[suggestion_id] = (likes, dislikes)
+
+        # Read the cached entries first: counting the misses may evict them
+        if missing:
+            # Misses, and entries too old to serve at all
+            self.misses += len(missing)
+            self.served += len(missing)
+            counts.update(await self._count(db, missing))
+
+        if stale:
+            self._refreshing.update(stale)
+            task = asyncio.get_running_loop().create_task(self._refresh(stale))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return counts
+
+    async def _refresh(self, suggestion_ids) -> None:
+        try:
+            async with database.AsyncSessionLocal() as session:
+                await self._count(session, suggestion_ids)
+            self.refreshes += 1
+        except Exception as e:
+            print(f"Vote count refresh failed: {str(e)}")
+        finally:
+            self._refreshing.difference_update(suggestion_ids)
+
+    def apply(self, suggestion_id: int, likes: int = 0, dislikes: int = 0) -> None:
+        """Add a committed vote's deltas to the cached counts, if we have them."""
+        entry = self._entries.get(suggestion_id)
+        if entry is not None:
+            entry[0] += likes
+            entry[1] += dislikes
+
+    def expire(self, suggestion_id: int) -> None:
+        # Another worker changed the votes: keep serving our numbers, but
+        # recount in the background on the next read
+        entry = self._entries.get(suggestion_id)
+        if entry is not None:
+            entry[3] = True
+
+    def forget(self, suggestion_id: int) -> None:
+        self._entries.pop(suggestion_id, None)
+
+    def metrics(self) -> dict:
+        return {
+            "max_staleness_seconds": self.max_staleness,
+            "entries": len(self._entries),
+            "served": self.served,
+            "misses": self.misses,
+            "stale_served": self.stale_served,
+            "strict_reads": self.strict_reads,
+            "refreshes": self.refreshes,
+            "mean_staleness_seconds": self.staleness_total / self.served if self.served else 0.0,
+            "max_staleness_served_seconds": self.staleness_max,
+        }
+
+
+vote_count_cache = VoteCountCache()
+
+
+async def _on_suggestion_changed(key: str) -> None:
+    vote_count_cache.expire(int(key))
+
+
+invalidation_bus.subscribe(SUGGESTIONS, _on_suggestion_changed)
@@ -0,0 +1,54 @@
+from typing import Dict, Iterable, Set
+from sqlalchemy import Table, select, delete, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Set-based helpers over the suggestion_likes / suggestion_dislikes association
+# tables. The ORM collections on both sides are write-only, so code that needs
+# to know about many votes at once should come through here.
+
+
+async def voted_ids(db: AsyncSession, table: Table, user_id: int, suggestion_ids: Iterable[int]) -> Set[int]:
+    """Which of ``suggestion_ids`` the user has a row for in ``table``."""
+    suggestion_ids = list(suggestion_ids)
+    if not suggestion_ids:
+        return set()
+    result = await db.execute(
+        select(table.c.suggestion_id).where(
+            table.c.user_id == user_id,
+            table.c.suggestion_id.in_(suggestion_ids)
+        )
+    )
+    return set(result.scalars().all())
+
+
+async def vote_counts(db: AsyncSession, table: Table, suggestion_ids: Iterable[int]) -> Dict[int, int]:
+    """Number of rows in ``table`` per suggestion, zero for suggestions without any."""
+    suggestion_ids = list(suggestion_ids)
+    counts = dict.fromkeys(suggestion_ids, 0)
+    if not suggestion_ids:
+        return counts
+    result = await db.execute(
+        select(table.c.suggestion_id, func.count())
+        .where(table.c.suggestion_id.in_(suggestion_ids))
+        .group_by(table.c.suggestion_id)
+    )
+    counts.update(result.all())
+    return counts
+
+
+async def add_votes(db: AsyncSession, table: Table, user_id: int, suggestion_ids: Iterable[int]) -> None:
+    rows = [{"user_id": user_id, "suggestion_id": suggestion_id} for suggestion_id in suggestion_ids]
+    if rows:
+        await db.execute(insert(table).values(rows).on_conflict_do_nothing())
+
+
+async def remove_votes(db: AsyncSession, table: Table, user_id: int, suggestion_ids: Iterable[int]) -> None:
+    suggestion_ids = list(suggestion_ids)
+    if suggestion_ids:
+        await db.execute(
+            delete(table).where(
+                table.c.user_id == user_id,
+                table.c.suggestion_id.in_(suggestion_ids)
+            )
+        )
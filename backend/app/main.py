@@ -1,25 +1,117 @@
-from fastapi import FastAPI
+import asyncio
+from datetime import timedelta
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import router
+from app.api.routes.suggestions import warm_up
+from app.core import database
+from app.core.config import Settings
+from app.core.revocation import revocation_store
+from app.core.invalidation import invalidation_bus
+from app.core.rollups import run_compactor
+from app.core.duplicates import backfill_index
+from app.core.feed_index import feed_index, load_feed_index
+from app.core.profiling import install_profiling
+from app.core.archive import run_archiver
+from app.core.vote_counts import vote_count_cache
 
-app = FastAPI()
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    settings = settings or Settings.from_env()
+    database.configure(settings.database_url, settings.read_database_urls)
+    invalidation_bus.enabled = settings.workers > 1
+    vote_count_cache.max_staleness = settings.vote_count_max_staleness
+    vote_count_cache.max_age = settings.vote_count_max_age
 
-# Add CORS middleware to allow frontend requests
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000"],  # Your frontend URL
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if settings.check_migrations:
+            async with database.engine.connect() as connection:
+                await database.check_migrations(connection)
 
-# Debug the router mounting
-print("Mounting API router at /api")
+        # Open the pooled connections before any request needs them
+        await database.warm_pool()
 
-# Mount the router directly at /api without additional prefixes
-app.include_router(router, prefix="/api")
+        async with database.AsyncSessionLocal() as session:
+            await invalidation_bus.start(session)
+            # Load the token denylist from the database
+            await revocation_store.load(session)
+            if settings.feed_index:
+                await load_feed_index(feed_index, session)
+            if settings.warm_up:
+                await warm_up(session)
 
-# Add a debug endpoint to check if the server is running
-@app.get("/")
-async def root():
-    return {"message": "API is running"}
\ No newline at end of file
+        tasks = [
+            asyncio.create_task(
+                run_compactor(database.AsyncSessionLocal, settings.rollup_interval_seconds)
+            ),
+            asyncio.create_task(backfill_index(database.AsyncSessionLocal)),
+        ]
+        if settings.archive_after_days is not None:
+            tasks.append(asyncio.create_task(run_archiver(
+                database.AsyncSessionLocal,
+                settings.archive_interval_seconds,
+                timedelta(days=settings.archive_after_days),
+                timedelta(days=settings.archive_inactive_days)
+            )))
+        if invalidation_bus.enabled:
+            tasks.append(asyncio.create_task(invalidation_bus.run(database.AsyncSessionLocal)))
+        yield
+        for task in tasks:
+            task.cancel()
+        feed_index.loaded = False
+        vote_count_cache.clear()
+        for pooled_engine in database.all_engines():
+            await pooled_engine.dispose()
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.settings = settings
+
+    # Add CORS middleware to allow frontend requests
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.allow_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    if settings.read_database_urls:
+        @app.middleware("http")
+        async def pin_writers_to_primary(request: Request, call_next):
+            response = await call_next(request)
+            read_only = request.method in ("GET", "HEAD", "OPTIONS") or getattr(request.state, "read_only", False)
+            if not read_only and response.status_code < 400:
+                response.set_cookie(
+                    key=database.PRIMARY_PIN_COOKIE,
+                    value="1",
+                    max_age=settings.read_your_writes_seconds,
+                    path="/",
+                    httponly=True,
+                    samesite="lax",
+                    secure=False
+                )
+            return response
+
+    # Mount the router directly at /api without additional prefixes
+    app.include_router(router, prefix="/api")
+
+    # Add a debug endpoint to check if the server is running
+    @app.get("/")
+    async def root():
+        return {"message": "API is running"}
+
+    # Off unless configured, so unprofiled deployments pay nothing for it
+    if settings.profile_token or settings.profile_sample_rate > 0:
+        install_profiling(
+            app,
+            database.all_engines(),
+            settings.profile_dir,
+            settings.profile_token,
+            settings.profile_sample_rate
+        )
+
+    return app
+
+app = create_app()
\ No newline at end of file
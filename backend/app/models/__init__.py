@@ -1,4 +1,23 @@
 from .user import User
 from .suggestion import Suggestion
+from .revoked_token import RevokedToken
+from .cache_invalidation import CacheInvalidation
+from .user_stats import UserStats
+from .duplicate_index import SuggestionMinHash, SuggestionLSHBucket
+from .archive import ArchivedSuggestion
+from .vote_event import VoteEvent, HourlyVoteRollup, DailyVoteRollup, VoteRollupCheckpoint
 
-__all__ = ["User", "Suggestion"]
\ No newline at end of file
+__all__ = [
+    "User",
+    "Suggestion",
+    "RevokedToken",
+    "CacheInvalidation",
+    "UserStats",
+    "SuggestionMinHash",
+    "SuggestionLSHBucket",
+    "VoteEvent",
+    "HourlyVoteRollup",
+    "DailyVoteRollup",
+    "VoteRollupCheckpoint",
+    "ArchivedSuggestion",
+]
\ No newline at end of file
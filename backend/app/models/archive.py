@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Table
+from app.core.database import Base
+
+# Cold copies of suggestions and their votes, moved out of the hot tables by
+# app.core.archive once they are old and no longer being voted on
+
+archived_suggestion_likes = Table(
+    "archived_suggestion_likes",
+    Base.metadata,
+    Column("user_id", Integer, primary_key=True),
+    Column("suggestion_id", Integer, primary_key=True, index=True)
+)
+
+archived_suggestion_dislikes = Table(
+    "archived_suggestion_dislikes",
+    Base.metadata,
+    Column("user_id", Integer, primary_key=True),
+    Column("suggestion_id", Integer, primary_key=True, index=True)
+)
+
+class ArchivedSuggestion(Base):
+    __tablename__ = "archived_suggestions"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    description = Column(String)
+    user_id = Column(Integer, index=True)
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime, nullable=False)
+    # Hidden by a moderator rather than archived for age; not served publicly
+    hidden = Column(Boolean, nullable=False, default=False)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from app.core.database import Base
+
+class CacheInvalidation(Base):
+    __tablename__ = "cache_invalidations"
+    # Workers poll for ids above the last one they saw, so an id must never
+    # be handed out twice, even after prune has emptied the table
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    topic = Column(String, nullable=False)
+    key = Column(String, nullable=False)
+    origin = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False, index=True)
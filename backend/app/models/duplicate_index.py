@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, LargeBinary, ForeignKey
+from app.core.database import Base
+
+class SuggestionMinHash(Base):
+    __tablename__ = "suggestion_minhashes"
+
+    suggestion_id = Column(Integer, ForeignKey("suggestions.id", ondelete="CASCADE"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)
+
+class SuggestionLSHBucket(Base):
+    __tablename__ = "suggestion_lsh_buckets"
+
+    band = Column(Integer, primary_key=True)
+    bucket = Column(Integer, primary_key=True)
+    suggestion_id = Column(Integer, ForeignKey("suggestions.id", ondelete="CASCADE"), primary_key=True, index=True)
@@ -1,29 +1,49 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Table
-from sqlalchemy.orm import relationship
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Table, DateTime
+from sqlalchemy.orm import relationship, backref
 from app.core.database import Base
 
 suggestion_likes = Table(
     "suggestion_likes",
     Base.metadata,
-    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
-    Column("suggestion_id", Integer, ForeignKey("suggestions.id"), primary_key=True)
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("suggestion_id", Integer, ForeignKey("suggestions.id", ondelete="CASCADE"), primary_key=True, index=True)
 )
 
 suggestion_dislikes = Table(
     "suggestion_dislikes",
     Base.metadata,
-    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
-    Column("suggestion_id", Integer, ForeignKey("suggestions.id"), primary_key=True)
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("suggestion_id", Integer, ForeignKey("suggestions.id", ondelete="CASCADE"), primary_key=True, index=True)
 )
 
 class Suggestion(Base):
     __tablename__ = "suggestions"
+    # Ids outlive their rows (archive, vote events, rollups), so SQLite must
+    # never hand a deleted suggestion's id to a new one
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
     description = Column(String)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     
     user = relationship("User", back_populates="suggestions")
-    liked_by = relationship("User", secondary=suggestion_likes, backref="liked_suggestions")
-    disliked_by = relationship("User", secondary=suggestion_dislikes, backref="disliked_suggestions")
\ No newline at end of file
+    # Vote lists can be huge, so these collections never load on access; read
+    # them with .select() or through app.core.votes
+    liked_by = relationship(
+        "User",
+        secondary=suggestion_likes,
+        lazy="write_only",
+        passive_deletes=True,
+        backref=backref("liked_suggestions", lazy="write_only", passive_deletes=True)
+    )
+    disliked_by = relationship(
+        "User",
+        secondary=suggestion_dislikes,
+        lazy="write_only",
+        passive_deletes=True,
+        backref=backref("disliked_suggestions", lazy="write_only", passive_deletes=True)
+    )
+
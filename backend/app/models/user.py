@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.models.suggestion import Suggestion
 
 class User(Base):
     __tablename__ = "users"
@@ -10,5 +11,12 @@ class User(Base):
     email = Column(String, unique=True, index=True)
     full_name = Column(String)
     hashed_password = Column(String)
+    # Case-folded copies used for uniqueness and login lookups, see
+    # app.core.security.normalize_login
+    username_normalized = Column(String, unique=True, index=True)
+    email_normalized = Column(String, unique=True, index=True)
     
-    suggestions = relationship("Suggestion", back_populates="user")
\ No newline at end of file
+    # Write-only like the vote collections on Suggestion; query them with
+    # .select() rather than loading them whole
+    suggestions = relationship("Suggestion", back_populates="user", lazy="write_only", passive_deletes=True)
+
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from app.core.database import Base
+
+class VoteEvent(Base):
+    __tablename__ = "vote_events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    suggestion_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    kind = Column(String, nullable=False)
+    delta = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False, index=True)
+
+class HourlyVoteRollup(Base):
+    __tablename__ = "vote_rollups_hourly"
+
+    bucket = Column(DateTime, primary_key=True)
+    suggestion_id = Column(Integer, primary_key=True)
+    likes = Column(Integer, nullable=False, default=0)
+    dislikes = Column(Integer, nullable=False, default=0)
+
+class DailyVoteRollup(Base):
+    __tablename__ = "vote_rollups_daily"
+
+    bucket = Column(DateTime, primary_key=True)
+    suggestion_id = Column(Integer, primary_key=True)
+    likes = Column(Integer, nullable=False, default=0)
+    dislikes = Column(Integer, nullable=False, default=0)
+
+class VoteRollupCheckpoint(Base):
+    __tablename__ = "vote_rollup_checkpoint"
+
+    id = Column(Integer, primary_key=True)
+    last_event_id = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, field_validator
+from typing import Any, List, Optional
+
+class BatchOperation(BaseModel):
+    # Client-chosen key echoed back with the result
+    id: str
+    # A GET path under /api, query string included, e.g. "/api/users/public/3"
+    path: str
+
+class BatchRequest(BaseModel):
+    requests: List[BatchOperation]
+
+    @field_validator("requests")
+    @classmethod
+    def ids_are_unique(cls, requests: List[BatchOperation]) -> List[BatchOperation]:
+        # Results are matched to operations by id
+        seen = set()
+        for operation in requests:
+            if operation.id in seen:
+                raise ValueError(f"Duplicate request id {operation.id!r}")
+            seen.add(operation.id)
+        return requests
+
+class BatchResult(BaseModel):
+    id: str
+    status: int
+    body: Optional[Any] = None
+
+class BatchResponse(BaseModel):
+    responses: List[BatchResult]
\ No newline at end of file
@@ -0,0 +1,5 @@
+from pydantic import BaseModel
+from typing import List
+
+class SuggestionIds(BaseModel):
+    ids: List[int]
\ No newline at end of file
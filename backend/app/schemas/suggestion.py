@@ -21,4 +21,24 @@ class SuggestionResponse(SuggestionBase):
 
 class SuggestionList(BaseModel):
     suggestions: List[SuggestionResponse]
-    total: int
\ No newline at end of file
+    total: int
+
+class TrendingSuggestion(SuggestionBase):
+    id: int
+    user_id: int
+    user_name: str
+    likes: int
+    dislikes: int
+    score: int
+
+class TrendingList(BaseModel):
+    window: str
+    suggestions: List[TrendingSuggestion]
+
+class DuplicateCandidate(BaseModel):
+    id: int
+    title: str
+    similarity: float
+
+class DuplicateCheck(BaseModel):
+    duplicates: List[DuplicateCandidate]
\ No newline at end of file
@@ -1,7 +1,20 @@
 from pydantic import BaseModel, EmailStr
+from typing import List
 
 class UserCreate(BaseModel):
     username: str
     email: str
     full_name: str
-    password: str
\ No newline at end of file
+    password: str
+
+class UserStatsResponse(BaseModel):
+    user_id: int
+    username: str
+    full_name: str | None = None
+    suggestion_count: int
+    likes_received: int
+    dislikes_received: int
+    score: int
+
+class Leaderboard(BaseModel):
+    users: List[UserStatsResponse]
\ No newline at end of file
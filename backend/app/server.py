@@ -0,0 +1,51 @@
+import argparse
+import os
+import socket
+from uvicorn import Config, Server
+from uvicorn.supervisors import Multiprocess
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    # uvicorn's own multi-worker socket is created with proto=0, which stops
+    # asyncio from setting TCP_NODELAY on accepted connections; keep-alive
+    # clients then stall ~40ms per response on Nagle + delayed ACK.
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with one or more worker processes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    # Workers read this to switch on the cross-process invalidation bus
+    os.environ["APP_WORKERS"] = str(args.workers)
+
+    # Only to fail fast: Multiprocess spawns fresh interpreters that import
+    # the app again themselves, so nothing loaded here is shared with them
+    import app.main  # noqa: F401
+
+    config = Config(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level="warning"
+    )
+    server = Server(config=config)
+
+    if args.workers > 1:
+        sock = bind_socket(args.host, args.port)
+        Multiprocess(config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Latency of the near-duplicate lookup as the suggestion corpus grows.
+
+Builds a scratch SQLite file, grows it to each size with synthetic index
+rows plus a handful of real near-duplicates, and times find_duplicates:
+
+    python -m benchmarks.bench_duplicates --sizes 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.core.duplicates import NUM_PERM, BANDS, minhash_signature, band_buckets, find_duplicates
+import app.models  # noqa: F401
+
+TITLE = "Add a dark mode toggle to the settings page"
+DESCRIPTION = "It would be great to switch the whole site to a dark theme from the settings."
+QUERIES = [
+    ("Add dark mode toggle in settings page", DESCRIPTION),
+    ("Dark mode toggle on the settings page please", DESCRIPTION),
+    ("More vegetarian food in the canteen", "Please add more options for lunch."),
+]
+
+
+def grow(path: str, start: int, stop: int, rng: random.Random) -> None:
+    conn = sqlite3.connect(path)
+    batch = 50_000
+    for first in range(start, stop, batch):
+        ids = range(first + 1, min(first + batch, stop) + 1)
+        conn.executemany(
+            "INSERT INTO suggestions (id, title, description, user_id) VALUES (?, ?, ?, 1)",
+            ((i, f"suggestion {i}", "") for i in ids)
+        )
+        conn.executemany(
+            "INSERT INTO suggestion_minhashes (suggestion_id, signature) VALUES (?, ?)",
+            ((i, rng.randbytes(NUM_PERM * 4)) for i in ids)
+        )
+        conn.executemany(
+            "INSERT INTO suggestion_lsh_buckets (band, bucket, suggestion_id) VALUES (?, ?, ?)",
+            ((band, rng.getrandbits(63), i) for i in ids for band in range(BANDS))
+        )
+        conn.commit()
+    conn.close()
+
+
+def plant_duplicates(path: str, first_id: int) -> None:
+    conn = sqlite3.connect(path)
+    for offset, title in enumerate([TITLE, TITLE + "!", "Dark mode toggle for settings"]):
+        suggestion_id = first_id + offset
+        signature = minhash_signature(title, DESCRIPTION)
+        conn.execute(
+            "INSERT INTO suggestions (id, title, description, user_id) VALUES (?, ?, ?, 1)",
+            (suggestion_id, title, DESCRIPTION)
+        )
+        conn.execute(
+            "INSERT INTO suggestion_minhashes (suggestion_id, signature) VALUES (?, ?)",
+            (suggestion_id, signature.tobytes())
+        )
+        conn.executemany(
+            "INSERT INTO suggestion_lsh_buckets (band, bucket, suggestion_id) VALUES (?, ?, ?)",
+            ((band, bucket, suggestion_id) for band, bucket in band_buckets(signature))
+        )
+    conn.commit()
+    conn.close()
+
+
+async def measure(path: str, repeat: int):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = sessionmaker(engine, class_=AsyncSession)
+    timings = []
+    found = 0
+    async with session_factory() as session:
+        for _ in range(repeat):
+            for title, description in QUERIES:
+                start = time.perf_counter()
+                duplicates = await find_duplicates(session, title, description)
+                timings.append(time.perf_counter() - start)
+                found += len(duplicates)
+    await engine.dispose()
+    return statistics.median(timings), max(timings), found / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        Base.metadata.create_all(create_engine(f"sqlite:///{path}"))
+        plant_duplicates(path, first_id=max(args.sizes) + 1)
+
+        size = 0
+        for target in sorted(args.sizes):
+            start = time.perf_counter()
+            grow(path, size, target, rng)
+            load = time.perf_counter() - start
+            size = target
+            median, worst, found = asyncio.run(measure(path, args.repeat))
+            print(
+                f"suggestions={size:<9} load={load:6.1f}s  "
+                f"median={median * 1000:6.2f}ms  max={worst * 1000:6.2f}ms  "
+                f"matches/round={found:.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
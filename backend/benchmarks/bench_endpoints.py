@@ -0,0 +1,69 @@
+"""Requests per second and statements per request for the hot endpoints.
+
+Seeds the large test dataset once into memory, then drives the app in-process
+over ASGI, so the numbers are the app's and SQLite's alone:
+
+    python -m benchmarks.bench_endpoints --requests 500
+"""
+import argparse
+import asyncio
+import time
+import httpx
+from app.core import database
+from app.core.config import Settings
+from app.core.security import create_access_token
+from app.main import create_app
+from tests.harness import Snapshot, seed_large, record_queries, count_queries
+
+ENDPOINTS = [
+    ("feed", "/api/suggestions?limit=20"),
+    ("feed deep page", "/api/suggestions?skip=90000&limit=20"),
+    ("feed top", "/api/suggestions?sort=top&limit=20"),
+    ("user suggestions", "/api/suggestions/user/2?limit=20"),
+    ("public suggestion", "/api/suggestions/public/500"),
+    ("leaderboard", "/api/users/leaderboard"),
+    ("me", "/api/users/me"),
+]
+
+
+async def run(url: str, requests: int):
+    app = create_app(Settings(database_url=url, warm_up=False))
+    record_queries(database.engine)
+    results = []
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            client.cookies.set("token", create_access_token({"sub": "user1"}))
+            for name, path in ENDPOINTS:
+                # "feed top" scans every suggestion; a few runs are enough
+                count = max(requests // 50, 1) if name == "feed top" else requests
+                with count_queries() as statements:
+                    start = time.perf_counter()
+                    for _ in range(count):
+                        response = await client.get(path)
+                        response.raise_for_status()
+                    elapsed = time.perf_counter() - start
+                results.append((name, count, elapsed, len(statements) / count))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--suggestions", type=int, default=100_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    snapshot = Snapshot(lambda conn: seed_large(conn, suggestions=args.suggestions, votes=3 * args.suggestions))
+    print(f"{'seed':<20} {time.perf_counter() - start:8.2f} s")
+    start = time.perf_counter()
+    copy = snapshot.restore()
+    print(f"{'restore':<20} {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    for name, count, elapsed, statements in asyncio.run(run(copy.url, args.requests)):
+        print(f"{name:<20} {count / elapsed:8.0f} req/s  ({elapsed / count * 1000:.2f} ms, {statements:.1f} statements each)")
+    copy.close()
+    snapshot.close()
+
+
+if __name__ == "__main__":
+    main()
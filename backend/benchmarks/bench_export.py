@@ -0,0 +1,56 @@
+"""Rows per second out of GET /api/suggestions/export.
+
+Seeds the large test dataset into memory and measures the NDJSON generator
+on its own and behind the endpoint over ASGI:
+
+    python -m benchmarks.bench_export --suggestions 100000 --runs 5
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+from app.core import database
+from app.core.config import Settings
+from app.core.export import export_suggestions, EXPORT_CHUNK_SIZE
+from app.main import create_app
+from tests.harness import Snapshot, seed_large
+
+
+async def run(url: str, runs: int, chunk_size: int):
+    app = create_app(Settings(database_url=url, warm_up=False))
+    results = {"generator": [], "endpoint": []}
+    async with app.router.lifespan_context(app):
+        for _ in range(runs):
+            start = time.perf_counter()
+            rows = 0
+            async for chunk in export_suggestions(database.AsyncSessionLocal, 0, chunk_size):
+                rows += chunk.count("\n")
+            results["generator"].append(rows / (time.perf_counter() - start))
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for _ in range(runs):
+                start = time.perf_counter()
+                response = await client.get("/api/suggestions/export")
+                rows = response.text.count("\n")
+                results["endpoint"].append(rows / (time.perf_counter() - start))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--suggestions", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    snapshot = Snapshot(lambda conn: seed_large(conn, suggestions=args.suggestions, votes=3 * args.suggestions))
+    copy = snapshot.restore()
+    for name, rates in asyncio.run(run(copy.url, args.runs, args.chunk_size)).items():
+        print(f"{name:<10} median {statistics.median(rates):9.0f} rows/s  best {max(rates):9.0f} rows/s")
+    copy.close()
+    snapshot.close()
+
+
+if __name__ == "__main__":
+    main()
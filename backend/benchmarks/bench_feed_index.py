@@ -0,0 +1,66 @@
+"""Memory and page latency of the in-process feed index.
+
+Loads synthetic rows straight into FeedIndex (no database involved):
+
+    python -m benchmarks.bench_feed_index --size 1000000
+"""
+import argparse
+import random
+import statistics
+import time
+from app.core.feed_index import FeedIndex
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--authors", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    rows = [
+        (i, rng.randrange(1, args.authors + 1), rng.randrange(0, 500), rng.randrange(0, 100))
+        for i in range(1, args.size + 1)
+    ]
+
+    index = FeedIndex()
+    start = time.perf_counter()
+    index.load(rows)
+    load = time.perf_counter() - start
+    del rows
+
+    per_million = index.memory_bytes() / args.size * 1_000_000
+    print(f"rows={args.size}  load={load:.2f}s  memory={index.memory_bytes() / 2**20:.1f} MiB "
+          f"({per_million / 2**20:.1f} MiB per million suggestions)")
+
+    deep = args.size // 2
+    cases = [
+        ("oldest, first page", lambda: index.page(0, 10, "oldest")),
+        ("newest, first page", lambda: index.page(0, 10, "newest")),
+        ("top, first page", lambda: index.page(0, 10, "top")),
+        (f"top, skip={deep}", lambda: index.page(deep, 10, "top")),
+        ("author filter, top", lambda: index.page(0, 10, "top", user_id=7)),
+    ]
+    for name, fn in cases:
+        print(f"{name:<24} {timed(fn, args.repeat) * 1e6:8.1f} us")
+
+    def vote():
+        suggestion_id = rng.randrange(1, args.size + 1)
+        _, _, likes, dislikes = index.row(suggestion_id)
+        index.set_counts(suggestion_id, likes + 1, dislikes)
+
+    print(f"{'vote update':<24} {timed(vote, args.repeat) * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
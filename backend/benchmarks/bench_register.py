@@ -0,0 +1,85 @@
+"""Throughput of the registration and login data path, with bcrypt kept apart.
+
+bcrypt dominates a real registration by design, so it is timed on its own and
+the handlers are then run against a scratch SQLite file with a precomputed
+hash, leaving only the database work:
+
+    python -m benchmarks.bench_register --users 5000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from fastapi import HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import create_engine
+from app.core import database
+from app.core.security import get_password_hash
+from app.api.routes import auth
+from app.schemas.user import UserCreate
+import app.models  # noqa: F401
+
+PASSWORD = "correct horse battery staple"
+
+
+async def run(users: int, hashed: str):
+    async def register(i: int, email_suffix: str = "") -> bool:
+        user = UserCreate(
+            username=f"user{i}",
+            email=f"user{i}{email_suffix}@example.com",
+            full_name=f"User {i}",
+            password=PASSWORD
+        )
+        async with database.AsyncSessionLocal() as session:
+            try:
+                await auth.register(user, db=session)
+                return True
+            except HTTPException:
+                return False
+
+    async def login(i: int) -> None:
+        form = OAuth2PasswordRequestForm(username=f"USER{i}@example.com", password=PASSWORD)
+        async with database.AsyncSessionLocal() as session:
+            await auth.login(form, db=session)
+
+    results = []
+    for name, fn in [
+        ("register", lambda i: register(i)),
+        ("register duplicate", lambda i: register(i, email_suffix=".dup")),
+        ("login by email", login),
+    ]:
+        start = time.perf_counter()
+        for i in range(users):
+            await fn(i)
+        results.append((name, time.perf_counter() - start))
+    await database.engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--hash-samples", type=int, default=5)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    for _ in range(args.hash_samples):
+        hashed = get_password_hash(PASSWORD)
+    per_hash = (time.perf_counter() - start) / args.hash_samples
+    print(f"{'bcrypt hash':<20} {per_hash * 1000:8.1f} ms each (excluded below)")
+
+    # Swap in the precomputed hash so only the database path is measured
+    auth.get_password_hash = lambda password: hashed
+    auth.verify_password = lambda password, stored: stored == hashed
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        database.Base.metadata.create_all(create_engine(f"sqlite:///{path}"))
+        database.configure(f"sqlite+aiosqlite:///{path}")
+        for name, elapsed in asyncio.run(run(args.users, hashed)):
+            print(f"{name:<20} {args.users / elapsed:8.0f} /s  ({elapsed / args.users * 1e6:.0f} us each)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Import time of app.main and time-to-first-response of a fresh server.
+
+Run from the backend directory against a migrated database:
+
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import http.client
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def measure_import() -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def get(port: int, path: str) -> float:
+    start = time.perf_counter()
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request("GET", path)
+    conn.getresponse().read()
+    conn.close()
+    return time.perf_counter() - start
+
+
+def measure_first_response(port: int, path: str):
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--workers", "1", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        while True:
+            try:
+                first = get(port, path)
+                break
+            except OSError:
+                time.sleep(0.01)
+        ready = time.perf_counter() - start
+        second = get(port, path)
+        return ready, first, second
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--path", default="/api/suggestions?limit=10")
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    runs = [measure_first_response(args.port, args.path) for _ in range(args.runs)]
+
+    print(f"import app.main          {statistics.median(imports) * 1000:8.1f} ms")
+    print(f"spawn to first response  {statistics.median(r[0] for r in runs) * 1000:8.1f} ms")
+    print(f"first request latency    {statistics.median(r[1] for r in runs) * 1000:8.1f} ms")
+    print(f"second request latency   {statistics.median(r[2] for r in runs) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
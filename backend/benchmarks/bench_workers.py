@@ -0,0 +1,81 @@
+"""Throughput of GET /api/suggestions as the number of workers grows.
+
+Run from the backend directory against a migrated database:
+
+    python -m benchmarks.bench_workers --workers 1 2 4 --duration 10
+"""
+import argparse
+import http.client
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+
+def wait_until_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def client(port: int, path: str, duration: float, results) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    done = 0
+    deadline = time.time() + duration
+    while time.time() < deadline:
+        conn.request("GET", path)
+        conn.getresponse().read()
+        done += 1
+    results.put(done)
+
+
+def run(workers: int, clients: int, duration: float, port: int, path: str) -> float:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--workers", str(workers), "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_ready(port)
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=client, args=(port, path, duration, results))
+            for _ in range(clients)
+        ]
+        for proc in procs:
+            proc.start()
+        total = sum(results.get() for _ in procs)
+        for proc in procs:
+            proc.join()
+        return total / duration
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", default="/api/suggestions?limit=10")
+    args = parser.parse_args()
+
+    baseline = None
+    for workers in args.workers:
+        rps = run(workers, args.clients, args.duration, args.port, args.path)
+        baseline = baseline or rps
+        print(f"workers={workers:<3} {rps:10.1f} req/s  x{rps / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
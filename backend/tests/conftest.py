@@ -0,0 +1,77 @@
+import asyncio
+import httpx
+import pytest
+from app.core import database
+from app.core.config import Settings
+from app.core.security import create_access_token
+from app.main import create_app
+from tests.harness import Snapshot, seed_small, seed_large, record_queries
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def lazy_load_guard():
+    # Any lazy load in a request path is an N+1 waiting to happen
+    database.guard_lazy_loads()
+    yield
+    database.guard_lazy_loads(False)
+
+
+@pytest.fixture(scope="session")
+def small_snapshot():
+    snapshot = Snapshot(seed_small)
+    yield snapshot
+    snapshot.close()
+
+
+@pytest.fixture(scope="session")
+def large_snapshot():
+    snapshot = Snapshot(seed_large)
+    yield snapshot
+    snapshot.close()
+
+
+@pytest.fixture
+def snapshot(small_snapshot):
+    # Override in a module to run its tests against another dataset
+    return small_snapshot
+
+
+@pytest.fixture
+def db(snapshot):
+    copy = snapshot.restore()
+    yield copy
+    copy.close()
+
+
+@pytest.fixture
+def settings(db):
+    return Settings(database_url=db.url, warm_up=False, moderators=["carol"])
+
+
+@pytest.fixture
+async def client(settings):
+    app = create_app(settings)
+    for engine in database.all_engines():
+        record_queries(engine)
+    async with app.router.lifespan_context(app):
+        # Every session shares the copy's one in-memory connection, so the
+        # startup backfill returning its session would roll back whatever the
+        # test had in flight; let it finish first
+        for task in asyncio.all_tasks():
+            if task.get_coro().__name__ == "backfill_index":
+                await task
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            yield client
+
+
+@pytest.fixture
+def login(client):
+    # Mint the token directly; going through /api/auth/login costs a bcrypt check
+    def login_as(username: str) -> None:
+        client.cookies.set("token", create_access_token({"sub": username}))
+    return login_as
@@ -0,0 +1,210 @@
+"""Seeded in-memory databases for the test suite and the endpoint benchmarks.
+
+The schema is built and seeded once into a template database. Every test then
+gets a private copy through SQLite's online backup API, which takes
+milliseconds even for the large dataset, and drives the app in-process over
+ASGI so the only I/O left is SQLite's.
+"""
+import itertools
+import random
+import sqlite3
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+from app.core import database
+from app.core.duplicates import minhash_signature, band_buckets, NUM_PERM
+from app.core.security import get_password_hash, normalize_login
+import app.models  # noqa: F401
+
+PASSWORD = "password"
+SEED_TIME = datetime(2026, 1, 1)
+
+_copies = itertools.count()
+_hashed_password = None
+
+
+def hashed_password() -> str:
+    # bcrypt costs a quarter of a second; every seeded user shares one hash
+    global _hashed_password
+    if _hashed_password is None:
+        _hashed_password = get_password_hash(PASSWORD)
+    return _hashed_password
+
+
+class Snapshot:
+    """A schema-complete, seeded template database that can be copied cheaply."""
+
+    def __init__(self, seed: Callable[[sqlite3.Connection], None]):
+        self.template = sqlite3.connect(":memory:", check_same_thread=False)
+        self._engine = create_engine("sqlite://", creator=lambda: self.template, poolclass=StaticPool)
+        database.Base.metadata.create_all(self._engine)
+        # Stamp the current heads so the app's startup migration check passes
+        self.template.execute("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)")
+        self.template.executemany(
+            "INSERT INTO alembic_version (version_num) VALUES (?)",
+            [(head,) for head in database.migration_heads()]
+        )
+        self.template.execute("PRAGMA foreign_keys=ON")
+        seed(self.template)
+        self.template.commit()
+
+    def restore(self) -> "DatabaseCopy":
+        name = f"file:snapshot{next(_copies)}?mode=memory&cache=shared"
+        keeper = sqlite3.connect(name, uri=True, check_same_thread=False)
+        self.template.backup(keeper)
+        return DatabaseCopy(f"sqlite+aiosqlite:///{name}&uri=true", keeper)
+
+    def close(self) -> None:
+        self._engine.dispose()
+        self.template.close()
+
+
+class DatabaseCopy:
+    """A private copy of a snapshot; it lives until ``close``."""
+
+    def __init__(self, url: str, keeper: sqlite3.Connection):
+        self.url = url
+        # A shared-cache in-memory database disappears with its last
+        # connection, so hold one open for as long as the copy is in use
+        self.keeper = keeper
+
+    def scalar(self, sql: str, *params):
+        return self.keeper.execute(sql, params).fetchone()[0]
+
+    def close(self) -> None:
+        self.keeper.close()
+
+
+_recording: ContextVar[Optional[List[str]]] = ContextVar("recording", default=None)
+
+
+def _record(conn, cursor, statement, parameters, context, executemany):
+    statements = _recording.get()
+    if statements is not None:
+        statements.append(statement)
+
+
+def record_queries(engine) -> None:
+    if not event.contains(engine.sync_engine, "before_cursor_execute", _record):
+        event.listen(engine.sync_engine, "before_cursor_execute", _record)
+
+
+@contextmanager
+def count_queries():
+    """Collect the statements sent while the block runs.
+
+    Only statements issued from the current task (and tasks it starts) are
+    collected, so background work such as the rollup compactor is not.
+    """
+    statements: List[str] = []
+    token = _recording.set(statements)
+    try:
+        yield statements
+    finally:
+        _recording.reset(token)
+
+
+def _index(conn: sqlite3.Connection, suggestion_id: int, title: str, description: str) -> None:
+    signature = minhash_signature(title, description)
+    if signature is None:
+        return
+    conn.execute(
+        "INSERT INTO suggestion_minhashes (suggestion_id, signature) VALUES (?, ?)",
+        (suggestion_id, signature.tobytes())
+    )
+    conn.executemany(
+        "INSERT INTO suggestion_lsh_buckets (band, bucket, suggestion_id) VALUES (?, ?, ?)",
+        [(band, bucket, suggestion_id) for band, bucket in band_buckets(signature)]
+    )
+
+
+def _insert_users(conn: sqlite3.Connection, usernames) -> None:
+    conn.executemany(
+        "INSERT INTO users (username, email, full_name, hashed_password, username_normalized, email_normalized)"
+        " VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (
+                username,
+                f"{username}@example.com",
+                username.capitalize(),
+                hashed_password(),
+                normalize_login(username),
+                normalize_login(f"{username}@example.com")
+            )
+            for username in usernames
+        ]
+    )
+
+
+def _compute_user_stats(conn: sqlite3.Connection) -> None:
+    conn.executescript("""
+        INSERT INTO user_stats (user_id, suggestion_count, likes_received, dislikes_received, score)
+        SELECT users.id,
+               (SELECT count(*) FROM suggestions WHERE suggestions.user_id = users.id),
+               (SELECT count(*) FROM suggestion_likes JOIN suggestions ON suggestions.id = suggestion_likes.suggestion_id
+                WHERE suggestions.user_id = users.id),
+               (SELECT count(*) FROM suggestion_dislikes JOIN suggestions ON suggestions.id = suggestion_dislikes.suggestion_id
+                WHERE suggestions.user_id = users.id),
+               0
+        FROM users;
+        UPDATE user_stats SET score = likes_received - dislikes_received;
+    """)
+
+
+def seed_small(conn: sqlite3.Connection) -> None:
+    """Three users and a dozen suggestions with a few votes each.
+
+    alice (id 1) wrote suggestions 1, 4, 7, 10, bob (id 2) 2, 5, 8, 11 and
+    carol (id 3) the rest. Suggestion n has n % 3 likes and n % 2 dislikes.
+    """
+    _insert_users(conn, ["alice", "bob", "carol"])
+    for n in range(1, 13):
+        title = f"Suggestion {n}: {['dark mode', 'faster search', 'offline sync', 'keyboard shortcuts'][n % 4]}"
+        description = f"Please add {title.split(': ')[1]} to the app, version {n}"
+        conn.execute(
+            "INSERT INTO suggestions (id, title, description, user_id, created_at) VALUES (?, ?, ?, ?, ?)",
+            (n, title, description, (n - 1) % 3 + 1, str(SEED_TIME + timedelta(hours=n)))
+        )
+        _index(conn, n, title, description)
+        conn.executemany(
+            "INSERT INTO suggestion_likes (user_id, suggestion_id) VALUES (?, ?)",
+            [(user_id, n) for user_id in range(1, n % 3 + 1)]
+        )
+        conn.executemany(
+            "INSERT INTO suggestion_dislikes (user_id, suggestion_id) VALUES (?, ?)",
+            [(user_id, n) for user_id in range(3, 3 - n % 2, -1)]
+        )
+    _compute_user_stats(conn)
+
+
+def seed_large(conn: sqlite3.Connection, users: int = 1000, suggestions: int = 100_000, votes: int = 300_000) -> None:
+    """A production-sized dataset with random authors and votes."""
+    rng = random.Random(0)
+    _insert_users(conn, [f"user{i}" for i in range(users)])
+    conn.executemany(
+        "INSERT INTO suggestions (id, title, description, user_id, created_at) VALUES (?, ?, ?, ?, ?)",
+        (
+            (
+                i,
+                f"Suggestion {i}",
+                f"Description of suggestion {i}",
+                rng.randint(1, users),
+                str(SEED_TIME + timedelta(seconds=i))
+            )
+            for i in range(1, suggestions + 1)
+        )
+    )
+    for table in ("suggestion_likes", "suggestion_dislikes"):
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {table} (user_id, suggestion_id) VALUES (?, ?)",
+            ((rng.randint(1, users), rng.randint(1, suggestions)) for _ in range(votes // 2))
+        )
+    # Placeholder signatures without LSH buckets: the startup backfill sees
+    # everything as indexed, and no seeded row is ever a duplicate candidate
+    conn.execute(
+        f"INSERT INTO suggestion_minhashes (suggestion_id, signature) SELECT id, zeroblob({NUM_PERM * 4}) FROM suggestions"
+    )
+    _compute_user_stats(conn)
@@ -0,0 +1,55 @@
+from datetime import timedelta
+import pytest
+from app.core import database
+from app.core.archive import move_to_archive, archive_cold_suggestions
+from app.core.rollups import compact
+from app.models.suggestion import Suggestion
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_new_suggestions_never_take_an_archived_suggestions_id(client, login, db):
+    login("alice")
+    await client.post("/api/suggestions/12/like")
+    async with database.AsyncSessionLocal() as session:
+        await compact(session)
+    async with database.AsyncSessionLocal() as session:
+        assert await move_to_archive(session, Suggestion.id == 12) == [12]
+
+    response = await client.post("/api/suggestions", json={"title": "After archiving", "description": "Takes a fresh id"})
+    assert response.json()["id"] == 13
+    assert (await client.get("/api/suggestions/public/12")).json()["title"] == "Suggestion 12: dark mode"
+    # The rollups still filed under 12 must not lift the new suggestion
+    trending = (await client.get("/api/suggestions/trending")).json()["suggestions"]
+    assert 13 not in [suggestion["id"] for suggestion in trending]
+
+
+async def test_cold_suggestions_move_with_their_votes(client, login, db):
+    login("bob")
+    await client.post("/api/suggestions/4/like")
+    async with database.AsyncSessionLocal() as session:
+        await compact(session)
+    stats = db.scalar("SELECT group_concat(likes_received || '/' || suggestion_count) FROM user_stats")
+
+    # Everything is old enough, but 4 was voted on today
+    archived = await archive_cold_suggestions(database.AsyncSessionLocal, timedelta(0), timedelta(days=1), batch_size=5)
+    assert archived == 11
+    body = (await client.get("/api/suggestions")).json()
+    assert (body["total"], [s["id"] for s in body["suggestions"]]) == (1, [4])
+
+    archived_five = (await client.get("/api/suggestions/public/5")).json()
+    assert (archived_five["likes_count"], archived_five["dislikes_count"]) == (2, 1)
+    assert db.scalar("SELECT group_concat(DISTINCT suggestion_id) FROM suggestion_likes") == "4"
+    # Archived suggestions keep counting towards their authors
+    assert db.scalar("SELECT group_concat(likes_received || '/' || suggestion_count) FROM user_stats") == stats
+
+
+async def test_authors_can_delete_archived_suggestions(client, login, db):
+    async with database.AsyncSessionLocal() as session:
+        await move_to_archive(session, Suggestion.id.in_([5, 6]))
+    login("bob")
+    assert (await client.delete("/api/suggestions/6")).status_code == 404
+    assert (await client.delete("/api/suggestions/5")).status_code == 204
+    assert (await client.get("/api/suggestions/public/5")).status_code == 404
+    assert db.scalar("SELECT count(*) FROM archived_suggestion_likes WHERE suggestion_id = 5") == 0
+    assert db.scalar("SELECT group_concat(id) FROM archived_suggestions") == "6"
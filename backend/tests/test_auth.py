@@ -0,0 +1,55 @@
+import pytest
+from app.core.revocation import RevocationStore
+from tests.harness import count_queries, PASSWORD
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_register_is_one_insert(client, db):
+    user = {"username": "Dave", "email": "dave@example.com", "full_name": "Dave", "password": PASSWORD}
+    with count_queries() as queries:
+        response = await client.post("/api/auth/register", json=user)
+    assert response.status_code == 201
+    assert len(queries) == 1, queries
+    assert db.scalar("SELECT username_normalized FROM users WHERE email = 'dave@example.com'") == "dave"
+
+
+async def test_register_rejects_case_insensitive_duplicates(client):
+    user = {"username": "ALICE", "email": "new@example.com", "full_name": "Alice", "password": PASSWORD}
+    response = await client.post("/api/auth/register", json=user)
+    assert (response.status_code, response.json()["detail"]) == (400, "Username already registered")
+
+    user = {"username": "alice2", "email": "Bob@Example.com", "full_name": "Bob", "password": PASSWORD}
+    response = await client.post("/api/auth/register", json=user)
+    assert (response.status_code, response.json()["detail"]) == (400, "Email already registered")
+
+
+async def test_login_by_email_is_one_lookup(client):
+    with count_queries() as queries:
+        response = await client.post("/api/auth/login", data={"username": "Carol@example.com", "password": PASSWORD})
+    assert response.status_code == 200
+    assert "token" in response.cookies
+    assert len(queries) == 1, queries
+
+
+async def test_logout_revokes_the_token(client):
+    await client.post("/api/auth/login", data={"username": "alice", "password": PASSWORD})
+    assert (await client.get("/api/users/me")).status_code == 200
+    await client.post("/api/auth/logout")
+    assert (await client.get("/api/users/me")).status_code == 401
+
+
+async def test_revocation_checks_never_query(client, login):
+    login("alice")
+    with count_queries() as queries:
+        assert (await client.get("/api/users/me")).status_code == 200
+    assert not [q for q in queries if "revoked_tokens" in q], queries
+
+
+def test_expired_revocations_are_pruned():
+    store = RevocationStore()
+    store.add("old", expires_at=100)
+    store.add("new", expires_at=300)
+    assert store.is_revoked("old") and not store.is_revoked("other") and not store.is_revoked(None)
+    assert store.prune(now=200) == 1
+    assert (store.is_revoked("old"), store.is_revoked("new")) == (False, True)
@@ -0,0 +1,40 @@
+import pytest
+from tests.harness import count_queries
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def settings(settings, db):
+    # Reads through a replica engine, so primary pinning is switched on
+    return settings.model_copy(update={"read_database_urls": [db.url]})
+
+
+async def test_batch_shares_one_session(client, login):
+    login("alice")
+    batch = {"requests": [
+        {"id": "feed", "path": "/api/suggestions?limit=2"},
+        {"id": "me", "path": "/api/users/me"},
+        {"id": "missing", "path": "/api/suggestions/public/99"},
+    ]}
+    with count_queries() as queries:
+        response = await client.post("/api/batch", json=batch)
+    statuses = {r["id"]: r["status"] for r in response.json()["responses"]}
+    assert statuses == {"feed": 200, "me": 200, "missing": 404}
+    assert len(queries) == 11, queries
+
+
+async def test_batch_rejects_duplicate_ids(client):
+    batch = {"requests": [{"id": "a", "path": "/api/suggestions"}, {"id": "a", "path": "/api/users/public/1"}]}
+    response = await client.post("/api/batch", json=batch)
+    assert response.status_code == 422
+
+
+async def test_batch_does_not_pin_to_the_primary(client, login):
+    login("alice")
+    response = await client.post("/api/batch", json={"requests": [{"id": "me", "path": "/api/users/me"}]})
+    assert response.status_code == 200
+    assert "primary_pin" not in response.cookies
+
+    response = await client.post("/api/suggestions", json={"title": "Pinned", "description": "A write pins"})
+    assert "primary_pin" in response.cookies
@@ -0,0 +1,77 @@
+import json
+import time
+import pytest
+from app.core import database
+from app.core.archive import move_to_archive
+from app.models.suggestion import Suggestion
+from tests.harness import count_queries
+
+pytestmark = pytest.mark.anyio
+
+
+def lines(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+async def test_export_streams_every_suggestion(client):
+    with count_queries() as queries:
+        response = await client.get("/api/suggestions/export")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = lines(response)
+    assert [row["id"] for row in rows] == list(range(1, 13))
+    assert rows[4] == {
+        "id": 5,
+        "title": "Suggestion 5: faster search",
+        "description": "Please add faster search to the app, version 5",
+        "user_id": 2,
+        "user_name": "Bob",
+        "likes_count": 2,
+        "dislikes_count": 1
+    }
+    # The cursor, then like and dislike counts for its one chunk
+    assert len(queries) == 3, queries
+
+
+async def test_export_resumes_after_the_last_id(client, login):
+    login("alice")
+    await client.delete("/api/suggestions/10")
+    response = await client.get("/api/suggestions/export", params={"after_id": 8})
+    assert [row["id"] for row in lines(response)] == [9, 11, 12]
+
+
+async def test_export_escapes_text(client, login):
+    login("alice")
+    title = 'Say "hello" in 日本語'
+    description = "Line one\nline two \\ tab\t and a 🚀"
+    await client.post("/api/suggestions", json={"title": title, "description": description})
+    row = lines(await client.get("/api/suggestions/export", params={"after_id": 12}))[0]
+    assert (row["title"], row["description"], row["likes_count"]) == (title, description, 0)
+
+
+async def test_export_includes_archived_but_not_hidden_suggestions(client, db):
+    async with database.AsyncSessionLocal() as session:
+        await move_to_archive(session, Suggestion.id == 5)
+    async with database.AsyncSessionLocal() as session:
+        await move_to_archive(session, Suggestion.id == 2, hidden=True)
+    with count_queries() as queries:
+        rows = lines(await client.get("/api/suggestions/export"))
+    assert [row["id"] for row in rows] == [1, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12]
+    assert (rows[3]["user_name"], rows[3]["likes_count"], rows[3]["dislikes_count"]) == ("Bob", 2, 1)
+    assert len(queries) == 3, queries
+
+
+class TestLarge:
+    @pytest.fixture
+    def snapshot(self, large_snapshot):
+        return large_snapshot
+
+    @pytest.mark.perf
+    async def test_export_throughput(self, client, db):
+        started = time.perf_counter()
+        response = await client.get("/api/suggestions/export", params={"after_id": 0})
+        elapsed = time.perf_counter() - started
+        rows = lines(response)
+        assert len(rows) == 100_000
+        assert sum(row["likes_count"] for row in rows) == db.scalar("SELECT count(*) FROM suggestion_likes")
+        # Well above the target locally; the margin absorbs slow CI machines
+        assert len(rows) / elapsed > 50_000
@@ -0,0 +1,61 @@
+import pytest
+from app.core.config import Settings
+from tests.harness import count_queries
+
+pytestmark = pytest.mark.anyio
+
+SCORES_SQL = """
+    SELECT id FROM suggestions ORDER BY
+        (SELECT count(*) FROM suggestion_likes WHERE suggestion_id = suggestions.id)
+        - (SELECT count(*) FROM suggestion_dislikes WHERE suggestion_id = suggestions.id) DESC,
+        id DESC
+"""
+
+
+@pytest.fixture
+def settings(db):
+    return Settings(database_url=db.url, warm_up=False, feed_index=True)
+
+
+async def feed(client, **params):
+    response = await client.get("/api/suggestions", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_pages_come_from_the_index_plus_one_text_query(client):
+    with count_queries() as queries:
+        body = await feed(client, limit=5)
+    assert body["total"] == 12
+    assert [s["id"] for s in body["suggestions"]] == [1, 2, 3, 4, 5]
+    assert [(s["likes_count"], s["dislikes_count"]) for s in body["suggestions"]] == [
+        (1, 1), (2, 0), (0, 1), (1, 0), (2, 1)
+    ]
+    assert len(queries) == 1, queries
+
+    body = await feed(client, sort="newest", skip=10, limit=5)
+    assert [s["id"] for s in body["suggestions"]] == [2, 1]
+
+    body = await feed(client, user_id=1)
+    assert (body["total"], [s["id"] for s in body["suggestions"]]) == (4, [1, 4, 7, 10])
+
+
+async def test_top_matches_the_database_ranking(client, db):
+    expected = [row[0] for row in db.keeper.execute(SCORES_SQL)]
+    body = await feed(client, sort="top", limit=12)
+    assert [s["id"] for s in body["suggestions"]] == expected
+
+
+async def test_writes_keep_the_index_in_step(client, login, db):
+    login("carol")
+    await client.post("/api/suggestions/3/like")
+    await client.post("/api/suggestions/9/like")
+    created = (await client.post("/api/suggestions", json={"title": "Indexed", "description": "Straight away"})).json()
+    await client.delete("/api/suggestions/6")
+
+    body = await feed(client, sort="newest", limit=3)
+    assert [s["id"] for s in body["suggestions"]] == [created["id"], 12, 11]
+    assert body["total"] == 12
+
+    body = await feed(client, sort="top", limit=12)
+    assert [s["id"] for s in body["suggestions"]] == [row[0] for row in db.keeper.execute(SCORES_SQL)]
@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from app.core import database
+from app.core.config import Settings
+from app.core.invalidation import InvalidationBus, invalidation_bus, SUGGESTIONS
+from app.core.vote_counts import vote_count_cache
+
+pytestmark = pytest.mark.anyio
+
+
+def bus_pair():
+    publisher = InvalidationBus(enabled=True, retention=0)
+    subscriber = InvalidationBus(enabled=True)
+    publisher.origin, subscriber.origin = 1, 2
+    received = []
+    subscriber.subscribe(SUGGESTIONS, received.append)
+    return publisher, subscriber, received
+
+
+async def publish(bus, key):
+    async with database.AsyncSessionLocal() as session:
+        bus.publish(session, SUGGESTIONS, key)
+        await session.commit()
+
+
+async def test_other_workers_receive_changes_but_not_their_own(client):
+    publisher, subscriber, received = bus_pair()
+    async with database.AsyncSessionLocal() as session:
+        await subscriber.start(session)
+    await publish(publisher, 1)
+    await publish(subscriber, 2)
+    async with database.AsyncSessionLocal() as session:
+        assert await subscriber.poll(session) == 2
+    assert received == ["1"]
+
+
+async def test_ids_keep_growing_after_prune_empties_the_table(client, db):
+    publisher, subscriber, received = bus_pair()
+    async with database.AsyncSessionLocal() as session:
+        await subscriber.start(session)
+    await publish(publisher, 1)
+    async with database.AsyncSessionLocal() as session:
+        await subscriber.poll(session)
+        await publisher.prune(session)
+    assert db.scalar("SELECT count(*) FROM cache_invalidations") == 0
+
+    await publish(publisher, 2)
+    async with database.AsyncSessionLocal() as session:
+        await subscriber.poll(session)
+    assert received == ["1", "2"]
+
+
+class TestTwoWorkers:
+    @pytest.fixture
+    def settings(self, db):
+        return Settings(database_url=db.url, warm_up=False, workers=2)
+
+    async def test_another_workers_vote_expires_our_cached_counts(self, client, db):
+        async def likes_of_three():
+            return (await client.get("/api/suggestions/public/3")).json()["likes_count"]
+
+        assert await likes_of_three() == 0
+        # The other worker votes, then tells everyone about it
+        other_worker = InvalidationBus(enabled=True)
+        other_worker.origin = invalidation_bus.origin + 1
+        db.keeper.execute("INSERT INTO suggestion_likes (user_id, suggestion_id) VALUES (1, 3)")
+        db.keeper.commit()
+        await publish(other_worker, 3)
+
+        async with database.AsyncSessionLocal() as session:
+            assert await invalidation_bus.poll(session) == 1
+        # Still served from the cache while it recounts in the background
+        assert await likes_of_three() == 0
+        await asyncio.gather(*vote_count_cache._tasks)
+        assert await likes_of_three() == 1
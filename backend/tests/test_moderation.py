@@ -0,0 +1,74 @@
+import json
+import pytest
+from app.core import database
+from app.core.moderation import run_in_chunks
+from app.core.rollups import compact
+
+pytestmark = pytest.mark.anyio
+
+
+def progress(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+async def moderate(client, action, ids):
+    response = await client.post(f"/api/moderation/suggestions/{action}", json={"ids": ids})
+    assert response.status_code == 200
+    return progress(response)
+
+
+async def test_new_suggestions_never_take_a_hidden_suggestions_id(client, login, db):
+    login("carol")
+    await moderate(client, "hide", [12])
+    response = await client.post("/api/suggestions", json={"title": "After hiding", "description": "Takes a fresh id"})
+    assert response.json()["id"] == 13
+
+    await moderate(client, "unhide", [12])
+    assert db.scalar("SELECT count(*) FROM suggestions WHERE id IN (12, 13)") == 2
+    updates = await moderate(client, "hide", [12])
+    assert updates[-1]["processed"] == {"hide": 1}
+    assert db.scalar("SELECT hidden FROM archived_suggestions WHERE id = 12") == 1
+
+
+async def test_purge_withdraws_votes_on_archived_suggestions(client, login, db):
+    login("bob")
+    await client.post("/api/suggestions/1/like")
+    async with database.AsyncSessionLocal() as session:
+        await compact(session)
+    login("carol")
+    # 1 is alice's own suggestion; alice liked bob's 2 before it was hidden
+    await moderate(client, "hide", [1, 2])
+
+    response = await client.post("/api/moderation/users/1/purge")
+    updates = progress(response)
+    assert updates[-1]["processed"]["archived"] == 1
+    assert updates[-1]["processed"]["archived likes"] == 1
+    assert db.scalar("SELECT count(*) FROM archived_suggestion_likes WHERE user_id = 1") == 0
+    assert db.scalar("SELECT count(*) FROM vote_rollups_daily WHERE suggestion_id = 1") == 0
+    # bob's stats match the likes that are left, hot and archived
+    assert db.scalar("SELECT likes_received FROM user_stats WHERE user_id = 2") == db.scalar(
+        "SELECT (SELECT count(*) FROM suggestion_likes JOIN suggestions ON suggestions.id = suggestion_id"
+        " WHERE suggestions.user_id = 2)"
+        " + (SELECT count(*) FROM archived_suggestion_likes JOIN archived_suggestions"
+        " ON archived_suggestions.id = suggestion_id WHERE archived_suggestions.user_id = 2)"
+    )
+
+
+async def test_a_failing_chunk_is_reported_and_ends_the_run(client):
+    async def step(db, limit):
+        raise RuntimeError("database is locked")
+    updates = [update async for update in run_in_chunks(step, "delete")]
+    assert updates == [{"phase": "delete", "error": "database is locked"}]
+
+
+async def test_delete_reaches_hidden_suggestions(client, login, db):
+    login("carol")
+    await moderate(client, "hide", [3])
+    suggestions = db.scalar("SELECT suggestion_count FROM user_stats WHERE user_id = 3")
+
+    updates = await moderate(client, "delete", [3, 99])
+    assert updates[-1]["processed"] == {"delete": 1}
+    assert db.scalar("SELECT count(*) FROM suggestions WHERE id = 3") == 0
+    assert db.scalar("SELECT count(*) FROM archived_suggestions WHERE id = 3") == 0
+    assert db.scalar("SELECT count(*) FROM archived_suggestion_dislikes WHERE suggestion_id = 3") == 0
+    assert db.scalar("SELECT suggestion_count FROM user_stats WHERE user_id = 3") == suggestions - 1
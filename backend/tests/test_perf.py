@@ -0,0 +1,74 @@
+"""The hot read paths against 100k suggestions and 300k votes.
+
+Statement counts must not grow with the data, and each request must stay well
+inside a budget that only an accidental table scan per row would blow.
+"""
+import time
+import pytest
+from tests.harness import count_queries
+
+pytestmark = [pytest.mark.anyio, pytest.mark.perf]
+
+BUDGET_SECONDS = 0.25
+# Ranking by score still counts every suggestion's votes when the feed
+# index is off
+TOP_BUDGET_SECONDS = 2.0
+
+
+@pytest.fixture
+def snapshot(large_snapshot):
+    return large_snapshot
+
+
+async def timed(client, path, **params):
+    with count_queries() as queries:
+        started = time.perf_counter()
+        response = await client.get(path, params=params)
+        elapsed = time.perf_counter() - started
+    assert response.status_code == 200, response.text
+    return response, queries, elapsed
+
+
+@pytest.mark.parametrize("skip", [0, 50_000, 99_990])
+async def test_feed_page(client, login, skip):
+    login("user1")
+    response, queries, elapsed = await timed(client, "/api/suggestions", skip=skip, limit=10)
+    assert response.json()["total"] == 100_000
+    assert len(response.json()["suggestions"]) == 10
+    assert len(queries) == 7, queries
+    assert elapsed < BUDGET_SECONDS
+
+
+async def test_feed_top(client):
+    response, queries, elapsed = await timed(client, "/api/suggestions", sort="top", limit=10)
+    assert len(queries) == 4, queries
+    assert elapsed < TOP_BUDGET_SECONDS
+
+
+async def test_user_suggestions(client, login):
+    login("user1")
+    response, queries, elapsed = await timed(client, "/api/suggestions/user/2", limit=50)
+    assert response.json()["total"] > 50
+    assert len(queries) == 7, queries
+    assert elapsed < BUDGET_SECONDS
+
+
+async def test_leaderboard(client):
+    response, queries, elapsed = await timed(client, "/api/users/leaderboard", limit=50)
+    assert len(response.json()["users"]) == 50
+    assert len(queries) == 1, queries
+    assert elapsed < BUDGET_SECONDS
+
+
+async def test_like_on_a_busy_suggestion(client, login, db):
+    login("user1")
+    busiest = db.scalar(
+        "SELECT suggestion_id FROM suggestion_likes GROUP BY suggestion_id ORDER BY count(*) DESC LIMIT 1"
+    )
+    with count_queries() as queries:
+        started = time.perf_counter()
+        response = await client.post(f"/api/suggestions/{busiest}/like")
+        elapsed = time.perf_counter() - started
+    assert response.status_code == 200
+    assert len(queries) == 10, queries
+    assert elapsed < BUDGET_SECONDS
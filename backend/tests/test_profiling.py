@@ -0,0 +1,41 @@
+import json
+import pytest
+from app.core.database import get_db
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def settings(settings, tmp_path):
+    return settings.model_copy(update={"profile_token": "secret", "profile_dir": str(tmp_path)})
+
+
+def route_dependant_calls(client):
+    app = client._transport.app
+    return {
+        sub.call
+        for route in app.routes if hasattr(route, "dependant")
+        for sub in route.dependant.dependencies
+    }
+
+
+async def test_unprofiled_requests_run_the_original_dependencies(client, tmp_path):
+    await client.get("/api/suggestions")
+    assert get_db in route_dependant_calls(client)
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_profiled_request_records_sql_and_dependencies(client, login, tmp_path):
+    login("alice")
+    response = await client.get("/api/suggestions", headers={"X-Profile": "secret"})
+    assert response.status_code == 200
+
+    [report] = tmp_path.glob("*.json")
+    profile = json.loads(report.read_text())
+    assert profile["route"] == "/api/suggestions"
+    assert len(profile["sql"]) == 7
+    assert {d["name"] for d in profile["dependencies"]} >= {"app.core.database.get_db"}
+    assert profile["other_task_samples"] == 0
+
+    # The timing wrappers come out again once no profile is running
+    assert get_db in route_dependant_calls(client)
@@ -0,0 +1,107 @@
+import pytest
+from tests.harness import count_queries
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_feed_counts_votes_once_then_serves_them_from_cache(client):
+    with count_queries() as queries:
+        response = await client.get("/api/suggestions", params={"limit": 5})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 12
+    assert [s["id"] for s in body["suggestions"]] == [1, 2, 3, 4, 5]
+    assert [(s["likes_count"], s["dislikes_count"]) for s in body["suggestions"]] == [
+        (1, 1), (2, 0), (0, 1), (1, 0), (2, 1)
+    ]
+    # total, page, like counts, dislike counts
+    assert len(queries) == 4, queries
+
+    with count_queries() as queries:
+        await client.get("/api/suggestions", params={"limit": 5})
+    assert len(queries) == 2, queries
+
+
+async def test_feed_for_a_user_adds_one_lookup_and_two_vote_probes(client, login):
+    login("alice")
+    with count_queries() as queries:
+        response = await client.get("/api/suggestions", params={"limit": 3})
+    suggestions = response.json()["suggestions"]
+    assert [s["user_has_liked"] for s in suggestions] == [True, True, False]
+    assert len(queries) == 7, queries
+
+
+async def test_feed_sorts_by_score(client):
+    with count_queries() as queries:
+        response = await client.get("/api/suggestions", params={"sort": "top", "limit": 3})
+    scores = [s["likes_count"] - s["dislikes_count"] for s in response.json()["suggestions"]]
+    assert scores == sorted(scores, reverse=True)
+    assert scores[0] == 2
+    assert len(queries) == 4, queries
+
+
+async def test_user_suggestions_page(client, login):
+    login("alice")
+    with count_queries() as queries:
+        response = await client.get("/api/suggestions/user/1")
+    assert response.status_code == 200
+    assert [s["id"] for s in response.json()["suggestions"]] == [1, 4, 7, 10]
+    assert len(queries) == 7, queries
+
+
+async def test_public_suggestion_counts_votes_only_on_a_miss(client):
+    with count_queries() as queries:
+        response = await client.get("/api/suggestions/public/3")
+    assert response.json()["user_name"] == "Carol"
+    assert len(queries) == 3, queries
+
+    with count_queries() as queries:
+        await client.get("/api/suggestions/public/3")
+    assert len(queries) == 1, queries
+
+    response = await client.get("/api/suggestions/public/99")
+    assert response.status_code == 404
+
+
+async def test_like_then_dislike(client, login, db):
+    login("alice")
+    with count_queries() as queries:
+        response = await client.post("/api/suggestions/3/like")
+    assert response.status_code == 200
+    assert (response.json()["likes_count"], response.json()["dislikes_count"]) == (1, 1)
+    assert len(queries) == 10, queries
+
+    response = await client.post("/api/suggestions/3/dislike")
+    assert (response.json()["likes_count"], response.json()["dislikes_count"]) == (0, 2)
+    assert db.scalar("SELECT likes_received - dislikes_received FROM user_stats WHERE user_id = 3") == \
+        db.scalar("SELECT score FROM user_stats WHERE user_id = 3")
+
+
+async def test_create_suggestion_indexes_it_for_duplicate_checks(client, login, db):
+    login("alice")
+    suggestion = {"title": "Export to spreadsheet", "description": "Download every suggestion as a CSV file"}
+    with count_queries() as queries:
+        response = await client.post("/api/suggestions", json=suggestion)
+    assert response.status_code == 201
+    assert len(queries) == 6, queries
+    assert db.scalar("SELECT suggestion_count FROM user_stats WHERE user_id = 1") == 5
+
+    with count_queries() as queries:
+        response = await client.post("/api/suggestions/check-duplicates", json=suggestion)
+    assert [d["id"] for d in response.json()["duplicates"]] == [13]
+    assert len(queries) == 3, queries
+
+
+async def test_delete_cascades_to_votes(client, login, db):
+    login("alice")
+    with count_queries() as queries:
+        response = await client.delete("/api/suggestions/1")
+    assert response.status_code == 204
+    assert len(queries) == 4, queries
+    assert db.scalar("SELECT count(*) FROM suggestion_likes WHERE suggestion_id = 1") == 0
+    assert db.scalar("SELECT count(*) FROM suggestion_lsh_buckets WHERE suggestion_id = 1") == 0
+
+    # Only the author may delete
+    response = await client.delete("/api/suggestions/2")
+    assert response.status_code == 404
+
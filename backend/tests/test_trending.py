@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+import pytest
+from app.core import database
+from app.core.rollups import compact
+from tests.harness import count_queries
+
+pytestmark = pytest.mark.anyio
+
+
+async def compact_now():
+    async with database.AsyncSessionLocal() as session:
+        return await compact(session)
+
+
+async def trending(client, window="24h"):
+    response = await client.get("/api/suggestions/trending", params={"window": window})
+    assert response.status_code == 200
+    return [(s["id"], s["likes"], s["dislikes"]) for s in response.json()["suggestions"]]
+
+
+async def test_trending_reads_compacted_votes_only(client, login):
+    for username in ("alice", "bob"):
+        login(username)
+        await client.post("/api/suggestions/3/like")
+    await client.post("/api/suggestions/4/dislike")
+    login("carol")
+    await client.post("/api/suggestions/8/like")
+    # Votes show up once the compactor has folded them into the rollups
+    assert await trending(client) == []
+
+    assert await compact_now() == 4
+    with count_queries() as queries:
+        assert await trending(client) == [(3, 2, 0), (8, 1, 0), (4, 0, 1)]
+    assert len(queries) == 1, queries
+
+    login("alice")
+    await client.post("/api/suggestions/3/like")
+    assert await compact_now() == 1
+    assert await compact_now() == 0
+    # Withdrawn votes subtract; ties go to the newer suggestion
+    assert await trending(client) == [(8, 1, 0), (3, 1, 0), (4, 0, 1)]
+
+
+async def test_windows_only_count_their_own_buckets(client, db):
+    three_days_ago = (datetime.utcnow() - timedelta(days=3)).strftime("%Y-%m-%d %H:%M:%S.%f")
+    db.keeper.execute(
+        "INSERT INTO vote_events (suggestion_id, user_id, kind, delta, created_at) VALUES (5, 3, 'like', 1, ?)",
+        (three_days_ago,)
+    )
+    db.keeper.commit()
+    assert await trending(client, "7d") == []
+    await compact_now()
+    assert await trending(client, "24h") == []
+    assert await trending(client, "7d") == [(5, 1, 0)]
+
+
+@pytest.mark.parametrize("window, span, bucket", [
+    ("1h", timedelta(hours=1), "hour"),
+    ("24h", timedelta(hours=24), "hour"),
+    ("7d", timedelta(days=7), "day"),
+])
+async def test_the_bucket_at_the_window_start_is_clipped(client, db, window, span, bucket):
+    now = datetime.utcnow()
+    since = now - span
+    if bucket == "day":
+        boundary = since.replace(hour=0, minute=0, second=0, microsecond=0)
+    else:
+        boundary = since.replace(minute=0, second=0, microsecond=0)
+    # The first vote is in the rollup bucket the window starts in, but older
+    # than the window itself
+    events = [(5, boundary + (since - boundary) / 2), (6, since + (now - since) / 100)]
+    for suggestion_id, created_at in events:
+        db.keeper.execute(
+            "INSERT INTO vote_events (suggestion_id, user_id, kind, delta, created_at) VALUES (?, 1, 'like', 1, ?)",
+            (suggestion_id, created_at.strftime("%Y-%m-%d %H:%M:%S.%f"))
+        )
+    db.keeper.commit()
+    await compact_now()
+    assert await trending(client, window) == [(6, 1, 0)]
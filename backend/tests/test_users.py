@@ -0,0 +1,59 @@
+import pytest
+from app.core import database
+from app.models.suggestion import Suggestion
+from app.models.user import User
+from tests.harness import count_queries
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_me(client, login):
+    login("bob")
+    with count_queries() as queries:
+        response = await client.get("/api/users/me")
+    assert response.json()["username"] == "bob"
+    assert len(queries) == 1, queries
+
+
+async def test_me_requires_a_token(client):
+    response = await client.get("/api/users/me")
+    assert response.status_code == 401
+
+
+async def test_public_profile(client):
+    with count_queries() as queries:
+        response = await client.get("/api/users/public/2")
+    assert response.json() == {"username": "bob", "full_name": "Bob"}
+    assert len(queries) == 1, queries
+
+
+async def test_leaderboard_reads_precomputed_stats(client):
+    with count_queries() as queries:
+        response = await client.get("/api/users/leaderboard")
+    users = response.json()["users"]
+    assert [u["username"] for u in users] == ["bob", "alice", "carol"]
+    assert len(queries) == 1, queries
+
+
+async def test_user_stats(client):
+    with count_queries() as queries:
+        response = await client.get("/api/users/1/stats")
+    stats = response.json()
+    assert (stats["suggestion_count"], stats["likes_received"]) == (4, 4)
+    assert len(queries) == 1, queries
+
+
+async def test_vote_and_author_collections_query_without_loading(client):
+    async with database.AsyncSessionLocal() as session:
+        alice = await session.get(User, 1)
+        suggestion = await session.get(Suggestion, 5)
+
+        async def ids(collection):
+            rows = await session.scalars(collection.select())
+            return sorted(row.id for row in rows)
+
+        assert await ids(alice.suggestions) == [1, 4, 7, 10]
+        assert await ids(alice.liked_suggestions) == [1, 2, 4, 5, 7, 8, 10, 11]
+        assert await ids(alice.disliked_suggestions) == []
+        assert await ids(suggestion.liked_by) == [1, 2]
+        assert await ids(suggestion.disliked_by) == [3]
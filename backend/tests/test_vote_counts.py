@@ -0,0 +1,115 @@
+import asyncio
+import pytest
+from app.core import database
+from app.core.config import Settings
+from app.core.vote_counts import VoteCountCache, vote_count_cache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("strict", [False, True])
+async def test_pages_larger_than_the_cache(client, strict):
+    cache = VoteCountCache(max_entries=2)
+    async with database.AsyncSessionLocal() as session:
+        await cache.get(session, [11, 12])
+        counts = await cache.get(session, range(1, 13), strict=strict)
+    assert len(counts) == 12
+    assert counts[5] == (2, 1)
+    assert counts[11] == (2, 1)
+    assert cache.metrics()["entries"] == 2
+
+
+async def test_clear_cancels_pending_refreshes(client):
+    cache = VoteCountCache(max_staleness=1.0)
+    async with database.AsyncSessionLocal() as session:
+        await cache.get(session, [1])
+        cache._entries[1][2] -= 10
+        await cache.get(session, [1])
+    refresh = next(iter(cache._tasks))
+    cache.clear()
+    await asyncio.gather(refresh, return_exceptions=True)
+    assert refresh.cancelled()
+    assert cache.metrics()["refreshes"] == 0
+
+
+async def test_stale_counts_are_served_then_refreshed(client, db):
+    vote_count_cache.reset_metrics()
+
+    async def counts_of_three(**params):
+        body = (await client.get("/api/suggestions/public/3", params=params)).json()
+        return body["likes_count"], body["dislikes_count"]
+
+    async def refreshed():
+        await asyncio.gather(*vote_count_cache._tasks)
+
+    assert await counts_of_three() == (0, 1)
+    # Votes from another worker, which this process never saw
+    db.keeper.execute("INSERT INTO suggestion_likes (user_id, suggestion_id) VALUES (1, 3)")
+    db.keeper.commit()
+    assert await counts_of_three() == (0, 1)
+
+    vote_count_cache._entries[3][2] -= 10
+    assert await counts_of_three() == (0, 1)
+    await refreshed()
+    assert await counts_of_three() == (1, 1)
+
+    # What the invalidation bus does when another worker reports a change
+    db.keeper.execute("DELETE FROM suggestion_dislikes WHERE suggestion_id = 3")
+    db.keeper.commit()
+    vote_count_cache.expire(3)
+    assert await counts_of_three() == (1, 1)
+    await refreshed()
+    assert await counts_of_three() == (1, 0)
+
+    db.keeper.execute("INSERT INTO suggestion_likes (user_id, suggestion_id) VALUES (2, 3)")
+    db.keeper.commit()
+    assert await counts_of_three(strict=True) == (2, 0)
+
+    metrics = (await client.get("/api/suggestions/vote-counts/metrics")).json()
+    assert (metrics["misses"], metrics["stale_served"], metrics["refreshes"], metrics["strict_reads"]) == (1, 1, 2, 1)
+    assert metrics["max_staleness_served_seconds"] >= 10
+
+
+async def test_counts_past_the_hard_age_are_recounted_before_serving(client, db):
+    cache = VoteCountCache(max_staleness=1.0, max_age=5.0)
+    async with database.AsyncSessionLocal() as session:
+        assert (await cache.get(session, [3]))[3] == (0, 1)
+        db.keeper.execute("INSERT INTO suggestion_likes (user_id, suggestion_id) VALUES (1, 3)")
+        db.keeper.commit()
+        cache._entries[3][2] -= 3
+        assert (await cache.get(session, [3]))[3] == (0, 1)
+        # Past max_age nothing stale is served, whatever became of the refresh
+        cache.clear()
+        await cache.get(session, [3])
+        cache._entries[3][2] -= 10
+        assert (await cache.get(session, [3]))[3] == (1, 1)
+    assert cache.metrics()["misses"] == 3
+
+
+class TestFeedIndex:
+    @pytest.fixture
+    def settings(self, db):
+        return Settings(database_url=db.url, warm_up=False, feed_index=True)
+
+    async def test_strict_reads_recount_the_index(self, client, db):
+        # A vote from another worker, which this process's index never saw
+        db.keeper.execute("INSERT INTO suggestion_likes (user_id, suggestion_id) VALUES (3, 1)")
+        db.keeper.commit()
+
+        async def likes_of_first(**params):
+            response = await client.get("/api/suggestions", params={"limit": 1, **params})
+            return response.json()["suggestions"][0]["likes_count"]
+
+        assert await likes_of_first() == 1
+        assert await likes_of_first(strict=True) == 2
+        assert await likes_of_first() == 2
+
+    async def test_votes_write_fresh_counts_into_the_index(self, client, login, db):
+        await client.get("/api/suggestions/public/1")
+        db.keeper.execute("INSERT INTO suggestion_likes (user_id, suggestion_id) VALUES (3, 1)")
+        db.keeper.commit()
+        login("bob")
+        response = await client.post("/api/suggestions/1/like")
+        assert response.json()["likes_count"] == 3
+        body = (await client.get("/api/suggestions", params={"limit": 1})).json()
+        assert body["suggestions"][0]["likes_count"] == 3